@@ -9,18 +9,31 @@ Used for testing the extraction pipeline without real sensitive data.
 """
 
 import json
+import logging
 import os
 import random
 import string
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Literal
 
 import tyro
 from faker import Faker
+from faker.providers.address.pt_BR import Provider as PtBrAddressProvider
 from pydantic import BaseModel, Field
 
 from src.logger import get_logger
 
+try:
+    import orjson  # Optional: C encoder, much faster for large datasets
+except ImportError:
+    orjson = None
+
 logger = None
-fake = Faker("pt_BR")  # Brazilian Portuguese locale
+# Dedicated generator for our own draws, kept apart from the global `random`
+# state (and seeded per worker chunk in parallel runs)
+rng = random.Random()
 
 
 # ============================================================================
@@ -39,6 +52,37 @@ EXTRACTION_SCHEMA = {
     "situacao": "Situação do profissional, normalmente no canto inferior direito.",
 }
 
+FIELDS = tuple(EXTRACTION_SCHEMA)
+# OCR label printed before each field value (e.g. "endereco_profissional" ->
+# "Endereco Profissional"), identical for every sample
+LABEL_TEXTS = {field: field.replace("_", " ").title() for field in FIELDS}
+
+# Weighted choice tables, built once instead of on every sample/field
+CATEGORIAS = ("ADVOGADO", "ADVOGADA", "SUPLEMENTAR", "ESTAGIARIO")
+SITUACOES = ("Situação Regular", "Situação Irregular")
+STATE_CHOICES = ("correct",) * 7 + ("omitted",) * 3  # 70% correct, 30% omitted
+LABEL_STATES = ("full",) * 9 + ("omitted",)  # 90% with label, 10% without
+SHUFFLE_CHOICES = (True,) * 33 + (False,) * 67  # 33% of samples shuffled
+SEPARATORS = ("\n",) * 8 + ("",) * 2 + (" ",) * 6 + ("   ",) * 2 + ("\t",) * 2
+
+# Alphabets and replacement values used to corrupt fields in
+# generate_wrong_data. The two alphabets differ only in order, which
+# matters for which character a given draw picks.
+ALNUM = string.ascii_letters + string.digits
+DIGITS_THEN_LETTERS = string.digits + string.ascii_letters
+CATEGORIAS_WRONG = ("ADV", "EST", "SUP", "ADVOGADA123", "")
+SITUACOES_WRONG = ("SUSPENSO", "CANCELADO", "BLOQUEADO", "")
+
+# The 27 Brazilian states (abbreviation, name) enumerated by Faker's pt_BR
+# address provider, sampled directly instead of dispatching through Faker.
+# Cities are composed from name templates and cannot be enumerated this way.
+STATE_ABBRS, STATE_NAMES = map(tuple, zip(*PtBrAddressProvider.estados))
+
+# Samples generated per Faker batch in single-process runs
+SAMPLES_PER_BATCH = 1000
+# Write buffer size for streamed JSON Lines output
+JSONL_BUFFER_SIZE = 1 << 20
+
 
 class Args(BaseModel):
     """CLI arguments for fake data generation."""
@@ -52,6 +96,17 @@ class Args(BaseModel):
         description="Filename for the generated dataset. If None, generates name based on num_samples and seed.",
     )
     seed: int = Field(1, description="Random seed for reproducibility.")
+    format: Literal["json", "jsonl"] = Field(
+        "json",
+        description="Output format. 'jsonl' streams one sample per line to disk "
+        "as it is generated instead of holding the whole dataset in memory.",
+    )
+    workers: int = Field(
+        1,
+        ge=1,
+        description="Number of worker processes. Output is reproducible for a "
+        "given (seed, workers) pair; 1 keeps the single-process sequence.",
+    )
     log_level: str = Field(
         "INFO", description="Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)."
     )
@@ -62,15 +117,48 @@ class Args(BaseModel):
 # ============================================================================
 
 
-def seed_random(seed_value: int):
+@lru_cache(maxsize=1)
+def get_fake() -> Faker:
+    """Return the shared Brazilian Portuguese Faker instance.
+
+    Built on first use rather than at import, so importing this module to
+    reuse its helpers does not pay for loading Faker's locale providers.
+
+    Returns:
+        The process-wide ``Faker("pt_BR")`` instance
+    """
+    return Faker("pt_BR")
+
+
+def seed_random(seed_value: int) -> random.Random:
     """Set random seed for reproducibility.
 
     Args:
         seed_value: Seed value for random number generators
+
+    Returns:
+        The seeded module-level ``rng`` instance
     """
-    random.seed(seed_value)
-    fake.seed_instance(seed_value)
+    rng.seed(seed_value)
+    get_fake().seed_instance(seed_value)
     logger.debug("Random seed set to: %d", seed_value)
+    return rng
+
+
+def _init_worker(log_level: str):
+    """Pool initializer: set up the per-process logger and Faker instance.
+
+    The Faker instance is loaded once here (or inherited already loaded from
+    a forked parent) instead of inside the first chunk. The module-level
+    ``rng`` and Faker instances are private to each process and are re-seeded
+    per chunk in ``generate_sample_chunk``.
+
+    Args:
+        log_level: Logging level for the worker logger
+    """
+    global logger
+    logger = get_logger(__name__, level=log_level)
+    get_fake()
 
 
 # ============================================================================
@@ -87,18 +175,40 @@ def generate_canonical_record() -> dict:
     Returns:
         Dictionary with all OAB card fields populated with valid data
     """
-    return {
-        "nome": fake.name(),
-        "inscricao": fake.rg(),
-        "seccional": fake.state_abbr(),
-        "subsecao": f"{fake.city()} - {fake.state()}",
-        "categoria": random.choice(
-            ["ADVOGADO", "ADVOGADA", "SUPLEMENTAR", "ESTAGIARIO"]
-        ),
-        "endereco_profissional": fake.address().replace("\n", ", "),
-        "telefone_profissional": fake.phone_number(),
-        "situacao": random.choice(["Situação Regular", "Situação Irregular"]),
+    return generate_canonical_records(1)[0]
+
+
+def generate_canonical_records(num_records: int) -> list[dict]:
+    """Generate a batch of canonical OAB card records.
+
+    Each field is generated as a whole column with the Faker provider method
+    bound once, which skips the Faker proxy attribute lookup on every call,
+    and the columns are then zipped into records.
+
+    Args:
+        num_records: Number of records to generate
+
+    Returns:
+        List of dictionaries with all OAB card fields populated
+    """
+    n = range(num_records)
+    fake = get_fake()
+    name, rg, city, address = fake.name, fake.rg, fake.city, fake.address
+    phone_number = fake.phone_number
+
+    columns = {
+        "nome": [name() for _ in n],
+        "inscricao": [rg() for _ in n],
+        "seccional": rng.choices(STATE_ABBRS, k=num_records),
+        "subsecao": [
+            f"{city()} - {state}" for state in rng.choices(STATE_NAMES, k=num_records)
+        ],
+        "categoria": rng.choices(CATEGORIAS, k=num_records),
+        "endereco_profissional": [address().replace("\n", ", ") for _ in n],
+        "telefone_profissional": [phone_number() for _ in n],
+        "situacao": rng.choices(SITUACOES, k=num_records),
     }
+    return [dict(zip(columns, values)) for values in zip(*columns.values())]
 
 
 def generate_wrong_data(field: str, canonical_value: str) -> str:
@@ -114,43 +224,65 @@ def generate_wrong_data(field: str, canonical_value: str) -> str:
     Returns:
         Incorrect value different from canonical_value
     """
-    wrong_data = canonical_value
-
-    while wrong_data == canonical_value:
-        if field == "nome":
-            wrong_data = (
-                canonical_value
-                + " "
-                + "".join(random.choices(string.ascii_letters + string.digits, k=3))
-            )
-        elif field == "inscricao":
-            wrong_data = str(random.randint(0, 99))
-        elif field == "seccional":
-            wrong_data = "".join(
-                random.choices(
-                    string.ascii_letters + string.digits, k=random.randint(3, 5)
-                )
-            )
-        elif field == "subsecao":
-            wrong_data = f"{fake.city()} {random.randint(1, 99)} - {fake.state()}"
-        elif field == "categoria":
-            wrong_data = random.choice(["ADV", "EST", "SUP", "ADVOGADA123", ""])
-        elif field == "endereco_profissional":
-            wrong_data = (
-                canonical_value.replace(",", ";") + " #" + str(random.randint(1, 100))
-            )
-        elif field == "telefone_profissional":
-            wrong_data = "".join(
-                random.choices(string.digits + string.ascii_letters, k=10)
-            )
-        elif field == "situacao":
-            wrong_data = random.choice(["SUSPENSO", "CANCELADO", "BLOQUEADO", ""])
-        else:
-            wrong_data = "DADO ERRADO " + str(random.randint(0, 999))
+    # Every branch yields a different value in bounded work: numbers step off
+    # the canonical one, pools exclude it, and the rest either extend it or
+    # are random strings that only need a suffix on the rare exact collision
+    if field == "nome":
+        wrong_data = canonical_value + " " + "".join(rng.choices(ALNUM, k=3))
+    elif field == "inscricao":
+        wrong_data = _other_number(100, canonical_value)
+    elif field == "seccional":
+        wrong_data = "".join(rng.choices(ALNUM, k=rng.randint(3, 5)))
+    elif field == "subsecao":
+        wrong_data = (
+            f"{get_fake().city()} {rng.randint(1, 99)} - {rng.choice(STATE_NAMES)}"
+        )
+    elif field == "categoria":
+        wrong_data = _other_choice(CATEGORIAS_WRONG, canonical_value)
+    elif field == "endereco_profissional":
+        wrong_data = canonical_value.replace(",", ";") + " #" + str(rng.randint(1, 100))
+    elif field == "telefone_profissional":
+        wrong_data = "".join(rng.choices(DIGITS_THEN_LETTERS, k=10))
+    elif field == "situacao":
+        wrong_data = _other_choice(SITUACOES_WRONG, canonical_value)
+    else:
+        wrong_data = "DADO ERRADO " + str(rng.randint(0, 999))
+
+    if wrong_data == canonical_value:
+        wrong_data += rng.choice(ALNUM)
 
     return wrong_data
 
 
+def _other_number(limit: int, canonical_value: str) -> str:
+    """Draw a number in ``[0, limit)`` whose text differs from the canonical one.
+
+    Args:
+        limit: Exclusive upper bound of the drawn number
+        canonical_value: Value the result must differ from
+
+    Returns:
+        Decimal string of the drawn number
+    """
+    value = rng.randrange(limit)
+    if str(value) == canonical_value:
+        value = (value + 1) % limit
+    return str(value)
+
+
+def _other_choice(pool: tuple[str, ...], canonical_value: str) -> str:
+    """Choose an entry of ``pool`` that differs from the canonical value.
+
+    Args:
+        pool: Candidate wrong values
+        canonical_value: Value the result must differ from
+
+    Returns:
+        Randomly chosen entry other than canonical_value
+    """
+    return rng.choice([value for value in pool if value != canonical_value])
+
+
 # ============================================================================
 # SECTION 4: OCR Noise Simulation
 # ============================================================================
@@ -185,15 +317,27 @@ def fuzz_text(text: str) -> str:
         "A": "4",
     }
 
-    fuzzed = ""
-    for char in text:
-        # Random space removal (10% chance)
-        if char == " " and random.random() < 0.1:
-            pass  # Skip space
-        else:
-            fuzzed += char
+    return _fuzz_str(text)
 
-    return fuzzed
+
+def _fuzz_str(text: str) -> str:
+    """Apply OCR-like noise to a string known to be a non-empty ``str``.
+
+    Fast path of ``fuzz_text`` for internal callers, without the empty-value
+    guard and ``str`` coercion.
+
+    Args:
+        text: Input text to fuzz
+
+    Returns:
+        Text with simulated OCR noise applied
+    """
+    # Random space removal (10% chance per space). Only spaces draw from the
+    # RNG, so splitting on them keeps the draw sequence of the char-by-char
+    # version while joining all pieces in a single pass.
+    head, *rest = text.split(" ")
+    rand = rng.random
+    return head + "".join(piece if rand() < 0.1 else " " + piece for piece in rest)
 
 
 # ============================================================================
@@ -201,7 +345,12 @@ def fuzz_text(text: str) -> str:
 # ============================================================================
 
 
-def generate_sample() -> dict:
+def generate_sample(
+    canonical_record: dict | None = None,
+    states: list[str] | None = None,
+    separators: list[str] | None = None,
+    shuffle: bool | None = None,
+) -> dict:
     """Generate a single fake OAB card sample.
 
     Creates a sample with:
@@ -211,19 +360,27 @@ def generate_sample() -> dict:
     - Random field ordering (33% shuffled)
     - Varied separator styles (newline, space, tab)
 
+    Args:
+        canonical_record: Ground-truth record to render (generated if None)
+        states: Per-field state decisions (drawn if None)
+        separators: Per-field separators (drawn if None)
+        shuffle: Whether to shuffle the OCR chunks (drawn if None)
+
     Returns:
-        Dictionary with label, extraction_schema, pdf_text, expected_answer
+        Dictionary with pdf_text and expected_answer (label and
+        extraction_schema are shared by all samples and written once)
     """
-    canonical_record = generate_canonical_record()
+    if canonical_record is None:
+        canonical_record = generate_canonical_record()
 
     ocr_chunks = []
     expected_answer = {}
 
-    # Generate each field with random state
-    for field in EXTRACTION_SCHEMA.keys():
-        # 70% correct, 30% omitted
-        state = random.choice(["correct"] * 7 + ["omitted"] * 3)
+    if states is None or separators is None or shuffle is None:
+        states, separators, shuffle = draw_field_decisions(1)[0]
 
+    # Generate each field with random state
+    for field, state in zip(FIELDS, states):
         value = None
         expected_value = None
 
@@ -233,79 +390,240 @@ def generate_sample() -> dict:
         elif state == "omitted":
             expected_value = None
             expected_answer[field] = expected_value
-            ocr_chunks.append((field.replace("_", " ").title(), expected_value))
+            ocr_chunks.append((LABEL_TEXTS[field], expected_value))
             continue
 
         expected_answer[field] = expected_value
 
-        # Generate field label
-        label_text_base = field.replace("_", " ").title()
+        # Field label
+        label_text_base = LABEL_TEXTS[field]
 
         # 90% with label, 10% without label
         label_state = "full"  # Only "full" labels for now
-        # label_state = random.choice(["full"] * 9 + ["omitted"] * 1)
+        # To enable, draw rng.choices(LABEL_STATES, k=num_fields) next to
+        # `states` above and zip it into this loop.
 
-        fuzzed_value = value  # Can apply fuzz_text(value) for noise
+        # Can apply _fuzz_str(value) for noise (Faker values are non-empty str)
+        fuzzed_value = value
 
         if label_state == "full":
             ocr_chunks.append((label_text_base, fuzzed_value))
         elif label_state == "omitted":
             ocr_chunks.append((None, fuzzed_value))
 
-    # Shuffle chunks 33% of the time (simulate unordered OCR)
-    if random.random() < 0.33:
-        random.shuffle(ocr_chunks)
-
-    logger.debug("OCR chunks: %s", ocr_chunks)
-    logger.debug("Expected answer: %s", expected_answer)
+    # Shuffle chunks 33% of the time (simulate unordered OCR). The order is
+    # drawn as one index permutation and gathered, instead of swapping list
+    # items in place.
+    num_chunks = len(ocr_chunks)
+    if shuffle and num_chunks > 1:
+        order = rng.sample(range(num_chunks), num_chunks)
+        ocr_chunks = [ocr_chunks[i] for i in order]
 
     # Assemble final OCR text
-    final_ocr_text = ""
-    for chunk in ocr_chunks:
-        label, value = chunk
-
+    parts = []
+    for (label, value), separator in zip(ocr_chunks, separators):
         # Add label if present
         if label is not None:
-            final_ocr_text += label
+            parts.append(label)
 
         # Random separator: 40% newline, 30% space, 10% nothing, etc.
-        separator = random.choice(
-            ["\n"] * 8 + [""] * 2 + [" "] * 6 + ["   "] * 2 + ["\t"] * 2,
-        )
-        final_ocr_text += separator
+        parts.append(separator)
 
         # Add value if present
         if value is not None:
-            final_ocr_text += value
+            parts.append(value)
+
+    final_ocr_text = "".join(parts)
 
-    logger.debug("Final OCR text:\n%s", final_ocr_text)
+    # One level check per sample instead of one per debug call
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("OCR chunks: %s", ocr_chunks)
+        logger.debug("Expected answer: %s", expected_answer)
+        logger.debug("Final OCR text:\n%s", final_ocr_text)
 
     return {
-        "label": LABEL,
-        "extraction_schema": EXTRACTION_SCHEMA,
         "pdf_text": final_ocr_text,
         "expected_answer": expected_answer,
     }
 
 
+def generate_sample_chunk(task: tuple[int, int]) -> list[dict]:
+    """Generate a chunk of samples from an independently seeded stream.
+
+    Args:
+        task: Tuple of (chunk_seed, num_samples)
+
+    Returns:
+        List of sample dictionaries
+    """
+    chunk_seed, num_samples = task
+    seed_random(chunk_seed)
+    return generate_samples(num_samples)
+
+
+def generate_samples(num_samples: int) -> list[dict]:
+    """Generate samples from the current random state, Faker work in bulk.
+
+    Args:
+        num_samples: Number of samples to generate
+
+    Returns:
+        List of sample dictionaries
+    """
+    records = generate_canonical_records(num_samples)
+    decisions = draw_field_decisions(num_samples)
+    return [
+        generate_sample(record, states, separators, shuffle)
+        for record, (states, separators, shuffle) in zip(records, decisions)
+    ]
+
+
+def draw_field_decisions(
+    num_samples: int,
+) -> list[tuple[list[str], list[str], bool]]:
+    """Draw every random layout decision for a batch of samples.
+
+    Every decision of the batch comes from one rng.choices call per table
+    instead of one draw per field or sample, and is then sliced per sample.
+
+    Args:
+        num_samples: Number of samples to draw decisions for
+
+    Returns:
+        List of (states, separators, shuffle) tuples, with one state and one
+        separator per field
+    """
+    num_fields = len(FIELDS)
+    total = num_samples * num_fields
+    states = rng.choices(STATE_CHOICES, k=total)  # 70% correct
+    separators = rng.choices(SEPARATORS, k=total)
+    shuffles = rng.choices(SHUFFLE_CHOICES, k=num_samples)  # 33% shuffled
+    return [
+        (
+            states[start : start + num_fields],
+            separators[start : start + num_fields],
+            shuffle,
+        )
+        for start, shuffle in zip(range(0, total, num_fields), shuffles)
+    ]
+
+
+def iter_samples(num_samples: int, seed: int, workers: int) -> Iterator[dict]:
+    """Yield the dataset samples, optionally generated across worker processes.
+
+    With a single worker the samples come from one stream seeded with ``seed``.
+    Otherwise the samples are split into chunks, each seeded from a master
+    ``random.Random(seed)``, and generated in a process pool (Faker and
+    ``random`` are pure Python, so threads would serialize on the GIL).
+    Chunks are yielded in order as they complete, so consumers can write them
+    out while the pool keeps generating.
+
+    Args:
+        num_samples: Number of samples to generate
+        seed: Master random seed
+        workers: Number of worker processes
+
+    Yields:
+        Sample dictionaries, in chunk order
+    """
+    if workers == 1:
+        seed_random(seed)
+        # Batches keep Faker calls bulked without materializing every record
+        for start in range(0, num_samples, SAMPLES_PER_BATCH):
+            yield from generate_samples(min(SAMPLES_PER_BATCH, num_samples - start))
+        return
+
+    # A few chunks per worker keeps the pool balanced near the end of the run
+    chunk_size = max(1, -(-num_samples // (workers * 8)))
+    master = random.Random(seed)
+    tasks = [
+        (master.getrandbits(64), min(chunk_size, num_samples - start))
+        for start in range(0, num_samples, chunk_size)
+    ]
+    logger.debug("Split %d samples into %d chunks", num_samples, len(tasks))
+
+    # Load Faker's locale providers before the pool starts, so fork-started
+    # workers inherit them instead of each loading their own copy
+    get_fake()
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(logging.getLevelName(logger.level),),
+    ) as executor:
+        for chunk in executor.map(generate_sample_chunk, tasks):
+            yield from chunk
+
+
 # ============================================================================
 # SECTION 6: File Output
 # ============================================================================
 
 
-def write_json(data: list, filename: str, path: str):
+def dataset_header() -> dict:
+    """Return the fields shared by every sample, written once per dataset.
+
+    Returns:
+        Dictionary with label and extraction_schema
+    """
+    return {"label": LABEL, "extraction_schema": EXTRACTION_SCHEMA}
+
+
+def write_json(samples: list, filename: str, path: str):
     """Write dataset to JSON file.
 
+    The file holds a single object: the shared header (label and
+    extraction_schema) plus a "samples" list, instead of repeating the schema
+    in every sample.
+
     Args:
-        data: List of sample dictionaries to save
+        samples: List of sample dictionaries to save
         filename: Output filename
         path: Directory path to save to
     """
     os.makedirs(path, exist_ok=True)
     output_path = os.path.join(path, filename)
+    data = {**dataset_header(), "samples": samples}
 
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    # Encode the whole document in memory and issue a single write
+    if orjson is not None:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        payload = json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+    with open(output_path, "wb") as f:
+        f.write(payload)
+
+    logger.info("Dataset saved to: %s", output_path)
+
+
+def _encode_line(obj: dict) -> bytes:
+    """Encode one JSON Lines record (with trailing newline)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8") + b"\n"
+
+
+def write_jsonl(samples: Iterator[dict], filename: str, path: str):
+    """Stream samples to a JSON Lines file, one sample per line.
+
+    The first line is the shared header (label and extraction_schema); every
+    following line is a sample.
+
+    Args:
+        samples: Iterable of sample dictionaries to save
+        filename: Output filename
+        path: Directory path to save to
+    """
+    os.makedirs(path, exist_ok=True)
+    output_path = os.path.join(path, filename)
+
+    # A 1 MiB buffer (default is 8 KiB) batches the many small line writes
+    # into few syscalls while memory stays bounded to one buffer
+    with open(output_path, "wb", buffering=JSONL_BUFFER_SIZE) as f:
+        f.write(_encode_line(dataset_header()))
+        for sample in samples:
+            f.write(_encode_line(sample))
 
     logger.info("Dataset saved to: %s", output_path)
 
@@ -326,27 +644,28 @@ def main(args: Args):
 
     logger.info("Starting fake dataset generation...")
 
-    # Set random seed for reproducibility
-    seed_random(args.seed)
-
-    # Generate samples
-    logger.info("Generating %d samples...", args.num_samples)
-    dataset = [generate_sample() for _ in range(args.num_samples)]
-
     # Determine output filename
+    extension = "." + args.format
     if not args.dataset_filename:
         dataset_filename = (
-            f"fake_dataset_{args.num_samples}samples_seed_{args.seed}.json"
+            f"fake_dataset_{args.num_samples}samples_seed_{args.seed}{extension}"
         )
     else:
         dataset_filename = (
             args.dataset_filename
-            if args.dataset_filename.endswith(".json")
-            else args.dataset_filename + ".json"
+            if args.dataset_filename.endswith(extension)
+            else args.dataset_filename + extension
         )
 
-    # Save to disk
-    write_json(dataset, dataset_filename, args.save_path)
+    # Generate samples (seeded for reproducibility) and save to disk
+    logger.info(
+        "Generating %d samples with %d worker(s)...", args.num_samples, args.workers
+    )
+    samples = iter_samples(args.num_samples, args.seed, args.workers)
+    if args.format == "jsonl":
+        write_jsonl(samples, dataset_filename, args.save_path)
+    else:
+        write_json(list(samples), dataset_filename, args.save_path)
 
     logger.info("✅ Fake dataset generation complete!")
     logger.info("Generated %d samples with seed %d", args.num_samples, args.seed)
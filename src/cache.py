@@ -7,23 +7,31 @@ most effective rules.
 
 Key components:
 - CacheItem: Wraps a Rule with success weight tracking
-- Node: Linked list node for LRU implementation
-- RulesList: Per-field LRU cache (Double Linked List) with automatic priority reordering
+- RulesList: Per-field LRU cache (weight-ordered list) with priority reordering
 - Cache: Top-level container managing RulesList for each field
 """
 
 from __future__ import annotations
 
-import json
 import os
+import sys
+import time
+from bisect import bisect_right, insort
 from collections import defaultdict
+from collections.abc import Iterator
+from operator import attrgetter
+from typing import BinaryIO
 
-from data import get_json_filename
+from data import encode_json, get_json_filename, load_json
 from logger import get_logger
 from rule import Rule
 
 logger = get_logger(__name__)
 
+# Cache output directories already created by save_dict_cache (a directory is
+# dropped again when a save into it fails, so it gets recreated)
+_ensured_dirs: set[str] = set()
+
 
 # ============================================================================
 # SECTION 1: Cache Item (Rule Wrapper)
@@ -41,6 +49,10 @@ class CacheItem:
         weight: Success counter (higher = more successful/prioritized)
     """
 
+    # No per-instance __dict__: smaller items and faster attribute access in
+    # the try_extract loop
+    __slots__ = ("rule", "weight")
+
     def __init__(self, rule: Rule, weight: int = 1):
         """Initialize cache item with a rule and optional weight.
 
@@ -108,100 +120,104 @@ class CacheItem:
             "weight": self.weight,
         }
 
-    def __eq__(self, other: "CacheItem") -> bool:
-        """Compare by weight for equality."""
-        return self.weight == other.weight
-
-    def __lt__(self, other: "CacheItem") -> bool:
-        """Compare by weight (less than)."""
-        return self.weight < other.weight
-
-    def __gt__(self, other: "CacheItem") -> bool:
-        """Compare by weight (greater than)."""
-        return self.weight > other.weight
-
     def __repr__(self):
         return f"{self.__class__.__name__}(rule={self.rule}, weight={self.weight})"
 
 
 # ============================================================================
-# SECTION 2: Linked List Node
+# SECTION 2: Rules List (Per-Field LRU Cache)
 # ============================================================================
 
 
-class Node:
-    """Doubly-linked list node for LRU cache implementation.
+def _priority_key(cache_item: CacheItem) -> int:
+    """Sort key placing higher-weight items first in ascending order."""
+    return -cache_item.weight
 
-    Each node wraps a CacheItem and maintains pointers to previous
-    and next nodes in the priority-ordered list.
 
-    Attributes:
-        item: CacheItem stored in this node
-        prev: Previous node in the list (higher priority)
-        next: Next node in the list (lower priority)
-    """
+def _load_rule(rule_data: dict, rule_pool: dict[tuple, Rule]) -> Rule:
+    """Validate a serialized Rule, reusing an identical one already loaded.
 
-    def __init__(self, item: CacheItem):
-        """Initialize node with a cache item.
-
-        Args:
-            item: CacheItem to store in this node
-        """
-        self.item = item
-        self.prev: Node | None = None
-        self.next: Node | None = None
-
-    def __repr__(self):
-        return f"{self.__class__.__name__}({self.item.__repr__()})"
+    Pydantic validation runs once per distinct rule; repeats (e.g. the same
+    rule learned for several labels) share one Rule instance.
 
+    Args:
+        rule_data: Rule as dict
+        rule_pool: Validated Rules keyed by their dict items, updated in place
 
-# ============================================================================
-# SECTION 3: Rules List (Per-Field LRU Cache)
-# ============================================================================
+    Returns:
+        Rule instance for rule_data
+    """
+    key = tuple(rule_data.items())
+    rule = rule_pool.get(key)
+    if rule is None:
+        rule = rule_pool[key] = Rule.model_validate(rule_data)
+    return rule
 
 
 class RulesList:
     """LRU cache for rules of a specific field.
 
-    Maintains a doubly-linked list of rules ordered by weight (priority).
-    When a rule successfully extracts a value, its weight increases and
-    it **bubbles up** in the list for faster future access.
+    Keeps the rules in a Python list ordered by weight (priority), so lookups
+    iterate the list directly instead of chasing linked-list pointers. When a
+    rule successfully extracts a value, its weight increases and it is
+    **moved up** past every lower-weight rule for faster future access.
 
     Attributes:
-        head: First node in the list (highest priority)
-        curr: Last node in the list (most recently added)
-        length: Number of rules in the list
+        _rules: CacheItems from highest to lowest priority
     """
 
     def __init__(self):
         """Initialize empty rules list."""
-        self.head: Node | None = None
-        self.curr: Node | None = None
-        self.length: int = 0
+        self._rules: list[CacheItem] = []
+
+    @classmethod
+    def from_data(
+        cls, items: list[dict], rule_pool: dict[tuple, Rule] | None = None
+    ) -> "RulesList":
+        """Build a rules list from serialized cache items in one pass.
+
+        Used when loading a cache: the list is filled by a single
+        comprehension instead of one ``add_rule`` call (and debug log) per
+        rule. Rules are never removed from a list, so there are no freed
+        items to recycle across loads.
+
+        Args:
+            items: List of dicts with ``rule`` (Rule as dict) and ``weight``
+            rule_pool: Already validated Rules, shared across loads (see
+                ``_load_rule``)
+
+        Returns:
+            RulesList holding the items ordered by priority (stable, so
+            equal-weight rules keep their saved order)
+        """
+        if rule_pool is None:
+            rule_pool = {}
+        instance = cls()
+        instance._rules = [
+            CacheItem(rule=_load_rule(item["rule"], rule_pool), weight=item["weight"])
+            for item in items
+        ]
+        # Saved caches are already ordered, which Timsort detects in one pass
+        instance._rules.sort(key=attrgetter("weight"), reverse=True)
+        return instance
 
     def add_rule(self, rule: Rule, weight: int = 1):
-        """Add a new Rule to the end of the list.
+        """Add a new Rule after every rule with the same or higher weight.
+
+        New rules start with the lowest weight, so in practice this appends
+        to the end; a higher initial weight is binary-inserted in place,
+        keeping the list ordered by priority.
 
         Args:
             rule: Rule object to add
             weight: Initial weight for the rule (default: 1)
         """
-        node = Node(item=CacheItem(rule=rule, weight=weight))
-        if not self.head:
-            # First rule in the list
-            self.head = node
-            self.curr = node
-        else:
-            # Append to end
-            self.curr.next = node
-            node.prev = self.curr
-            self.curr = node
-        self.length += 1
+        insort(self._rules, CacheItem(rule=rule, weight=weight), key=_priority_key)
         logger.debug(
             "Added rule to cache - Rule pattern: %s, Weight: %d, Total rules: %d",
             rule.rule[:50] if len(rule.rule) > 50 else rule.rule,
             weight,
-            self.length,
+            len(self._rules),
         )
 
     def try_extract(self, text: str) -> str | None:
@@ -216,17 +232,21 @@ class RulesList:
         Returns:
             Extracted value or None if no rule succeeds
         """
-        for node in self:
-            cache_item = node.item
-            extracted_text = cache_item.apply(text)
+        if not text:
+            # Rule.apply returns None for empty text, so no rule can match
+            logger.debug("No cached rule matched for this field")
+            return None
+
+        for index, cache_item in enumerate(self._rules):
+            # Call the Rule directly, skipping the CacheItem delegation frames
+            rule = cache_item.rule
+            extracted_text = rule.apply(text)
 
             # Check if extraction was successful and valid
-            if cache_item.validate(extracted_text):
+            if rule.validate(extracted_text):
                 logger.debug(
                     "Rule matched - Pattern: %s, Current weight: %d",
-                    cache_item.rule.rule[:50]
-                    if len(cache_item.rule.rule) > 50
-                    else cache_item.rule.rule,
+                    rule.rule[:50] if len(rule.rule) > 50 else rule.rule,
                     cache_item.weight,
                 )
 
@@ -237,8 +257,8 @@ class RulesList:
                     "✓ Incremented rule weight: %d → %d", old_weight, cache_item.weight
                 )
 
-                # Bubble up in priority list
-                self.update(node)
+                # Move up in priority list
+                self._promote(index)
 
                 return extracted_text
 
@@ -246,46 +266,31 @@ class RulesList:
         logger.debug("No cached rule matched for this field")
         return None
 
-    def update(self, node: Node):
-        """Bubble node up in the list based on increased weight.
+    def _promote(self, index: int):
+        """Move the rule at ``index`` ahead of every lower-weight predecessor.
 
-        This maintains the priority ordering where higher-weight rules
-        are checked first.
+        The rules before ``index`` are still ordered by weight, so the new
+        position is found by binary search over that prefix, and the rule is
+        moved with a single list pop/insert instead of pairwise swaps. This
+        keeps the priority ordering where higher-weight rules are checked
+        first.
 
         Args:
-            node: Node to reposition in the list
+            index: Position of the rule whose weight was just increased
         """
-        if not node.prev:
-            # Already at head, no need to move
-            return
+        rules = self._rules
+        weight = rules[index].weight
+        # First position in the prefix holding a lower weight
+        target = bisect_right(rules, -weight, hi=index, key=_priority_key)
 
-        # Bubble up while node has higher weight than predecessor
-        while node.prev and node.prev.item < node.item:
-            prev = node.prev
-            prev_prev = prev.prev
-            next = node.next
-
-            # Update head if node becomes new head
-            if prev_prev:
-                prev_prev.next = node
-            else:
-                self.head = node
-            node.prev = prev_prev
-
-            # Update tail if node was at tail
-            if next:
-                next.prev = prev
-            else:
-                self.curr = prev
-            prev.next = next
-
-            # Swap node and prev
-            node.next = prev
-            prev.prev = node
+        if target == index:
+            # Already in place, no need to move
+            return
 
+        rules.insert(target, rules.pop(index))
         logger.debug(
-            "Rule reordered - New weight: %d (bubbled up in priority)",
-            node.item.weight,
+            "Rule reordered - New weight: %d (moved up in priority)",
+            weight,
         )
 
     def get_data(self) -> list[dict]:
@@ -294,32 +299,32 @@ class RulesList:
         Returns:
             List of dictionaries with rule and weight information
         """
-        data = []
-        for node in self:
-            data.append(node.item.to_dict())
-        return data
+        return list(self.iter_data())
+
+    def iter_data(self) -> Iterator[dict]:
+        """Yield cache items as dictionaries, in priority order.
+
+        Yields:
+            Dictionary with rule and weight information per item
+        """
+        for cache_item in self._rules:
+            yield cache_item.to_dict()
 
     def __len__(self):
         """Return number of rules in the list."""
-        return self.length
+        return len(self._rules)
 
     def __repr__(self):
-        list_repr = []
-        for node in self:
-            list_repr.append(repr(node))
-        nodes_repr = ",".join(list_repr)
-        return f"{self.__class__.__name__}(nodes=[{nodes_repr}])"
+        items_repr = ",".join(repr(cache_item) for cache_item in self._rules)
+        return f"{self.__class__.__name__}(items=[{items_repr}])"
 
     def __iter__(self):
-        """Iterate through nodes from head to tail (highest to lowest priority)."""
-        current = self.head
-        while current:
-            yield current
-            current = current.next
+        """Iterate through cache items from highest to lowest priority."""
+        return iter(self._rules)
 
 
 # ============================================================================
-# SECTION 4: Cache (Top-Level Container)
+# SECTION 3: Cache (Top-Level Container)
 # ============================================================================
 
 
@@ -332,11 +337,19 @@ class Cache:
 
     Attributes:
         fields: Dictionary mapping field names to RulesList instances
+        _rule_count: Number of rules across all fields, kept up to date by
+            ``add_rule`` and ``load_from_dict``
     """
 
     def __init__(self):
         """Initialize empty cache with defaultdict of RulesLists."""
         self.fields = defaultdict(RulesList)
+        self._rule_count = 0
+
+    @property
+    def num_rules(self) -> int:
+        """Total number of rules across all fields."""
+        return self._rule_count
 
     def add_rule(self, field: str, rule: Rule):
         """Add a rule to a specific field's cache.
@@ -345,7 +358,10 @@ class Cache:
             field: Field name to add rule to
             rule: Rule object to add
         """
-        self.fields[field].add_rule(rule)
+        # Interned keys let lookups with the same field name object take the
+        # identity fast path in dict comparisons
+        self.fields[sys.intern(field)].add_rule(rule)
+        self._rule_count += 1
         logger.debug("Added rule to field '%s'", field)
 
     def try_extract(self, field: str, text: str) -> str | None:
@@ -358,7 +374,11 @@ class Cache:
         Returns:
             Extracted value or None if no rule succeeds
         """
-        rules_list = self.fields[field]
+        # Look up without defaultdict insertion: extraction must not create
+        # empty RulesLists for fields that have no rules yet
+        rules_list = self.fields.get(field)
+        if rules_list is None:
+            return None
         extracted_text = rules_list.try_extract(text)
         return extracted_text
 
@@ -378,24 +398,27 @@ class Cache:
         return data
 
     @classmethod
-    def load_from_dict(cls, label: str, data: dict) -> "Cache":
+    def load_from_dict(
+        cls, label: str, data: dict, rule_pool: dict[tuple, Rule] | None = None
+    ) -> "Cache":
         """Load cache from dictionary data.
 
         Args:
             label: Label/name for the cache (for logging)
             data: Dictionary mapping field names to list of rule dicts
+            rule_pool: Already validated Rules to share across fields and
+                caches (a new pool is used if None)
 
         Returns:
             Cache instance populated with loaded rules
         """
+        if rule_pool is None:
+            rule_pool = {}
         instance = cls()
         for field, items in data.items():
-            rules_list = RulesList()
-            for item in items:
-                # Deserialize Rule object from dict
-                rule_obj = Rule.model_validate(item["rule"])
-                rules_list.add_rule(rule=rule_obj, weight=item["weight"])
-            instance.fields[field] = rules_list
+            rules_list = RulesList.from_data(items, rule_pool)
+            instance.fields[sys.intern(field)] = rules_list
+            instance._rule_count += len(rules_list)
 
         logger.info(
             "Cache loaded for label '%s' from dict (%d fields)",
@@ -428,10 +451,11 @@ def load_dict_cache_json(
         return None
 
     try:
-        with open(cache_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = load_json(cache_path)
+        # One pool for the whole file, so identical rules are validated once
+        rule_pool = {}
         loaded_caches = {
-            label: Cache.load_from_dict(label, cache_data)
+            label: Cache.load_from_dict(label, cache_data, rule_pool)
             for label, cache_data in data.items()
         }
     except Exception as e:
@@ -460,17 +484,112 @@ def save_dict_cache(dict_caches: dict[str, Cache], config: dict):
 
     cache_path = os.path.join(config.data_folder, cache_filename)
 
-    # Ensure directory exists
+    # Ensure directory exists (once per directory, saves happen after every
+    # generated rule)
     output_dir = os.path.dirname(cache_path)
-    if output_dir:
+    if output_dir and output_dir not in _ensured_dirs:
         os.makedirs(output_dir, exist_ok=True)
+        _ensured_dirs.add(output_dir)
 
-    # Convert all caches to dicts for serialization
-    data_to_save = {label: cache.to_dict() for label, cache in dict_caches.items()}
-
+    # Write to a temporary file and atomically swap it in, so an interrupted
+    # save never leaves a truncated cache behind
+    tmp_path = cache_path + ".tmp"
     try:
-        with open(cache_path, "w", encoding="utf-8") as f:
-            json.dump(data_to_save, f, ensure_ascii=False, indent=2)
+        with open(tmp_path, "wb") as f:
+            _write_caches(f, dict_caches)
+        os.replace(tmp_path, cache_path)
         logger.info("Saved caches to %s", cache_path)
     except Exception as e:
         logger.error("Error saving caches to %s: %s", cache_path, str(e))
+        # Don't leave a partial temporary file behind
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        except OSError as remove_error:
+            logger.warning("Could not remove %s: %s", tmp_path, remove_error)
+        # The directory may have been removed during the run; check it
+        # again on the next save
+        _ensured_dirs.discard(output_dir)
+
+
+def _write_caches(f: BinaryIO, dict_caches: dict[str, Cache]):
+    """Stream caches to a binary file as 2-space-indented JSON.
+
+    Only one field's rules are serialized at a time, instead of first
+    building the whole ``{label: cache.to_dict()}`` mapping and encoding it
+    in one piece. The output is byte-identical to that full dump: each
+    field's encoded list is re-indented to its nesting depth (JSON strings
+    never contain raw newlines, so replacing them is safe).
+
+    Args:
+        f: File opened in binary write mode
+        dict_caches: Dictionary mapping labels to Cache instances
+    """
+    f.write(b"{")
+    for label_index, (label, cache) in enumerate(dict_caches.items()):
+        if label_index:
+            f.write(b",")
+        f.write(b"\n  " + encode_json(label) + b": ")
+        if not cache.fields:
+            f.write(b"{}")
+            continue
+
+        f.write(b"{")
+        for field_index, (field, rules_list) in enumerate(cache.fields.items()):
+            if field_index:
+                f.write(b",")
+            f.write(b"\n    " + encode_json(field) + b": ")
+            rules_json = encode_json(list(rules_list.iter_data()))
+            f.write(rules_json.replace(b"\n", b"\n    "))
+        f.write(b"\n  }")
+    f.write(b"\n}" if dict_caches else b"}")
+
+
+class CacheWriter:
+    """Coalesce repeated cache saves into at most one write per interval.
+
+    The pipeline asks for a save after every generated rule (and after every
+    full cache hit, since rule weights change); each save rewrites the whole
+    cache file. Requests arriving within ``min_interval`` seconds of the last
+    write only mark the cache as dirty, and the next request after the
+    interval (or ``flush``) writes it once.
+
+    Attributes:
+        dict_caches: Dictionary mapping labels to Cache instances
+        config: Configuration object with save parameters
+        min_interval: Minimum seconds between two writes (0 writes on every
+            request)
+    """
+
+    def __init__(self, dict_caches: dict[str, Cache], config, min_interval=2.0):
+        """Initialize the writer; the first request always writes.
+
+        Args:
+            dict_caches: Dictionary mapping labels to Cache instances
+            config: Configuration object with save parameters
+            min_interval: Minimum seconds between two writes
+        """
+        self.dict_caches = dict_caches
+        self.config = config
+        self.min_interval = min_interval
+        self._last_write = float("-inf")
+        self._dirty = False
+
+    def request_save(self):
+        """Mark the caches as changed and write them if the interval elapsed."""
+        self._dirty = True
+        if time.monotonic() - self._last_write >= self.min_interval:
+            self.flush()
+
+    def flush(self, force: bool = False):
+        """Write the caches now if there are unsaved changes.
+
+        Args:
+            force: Write even if no save was requested since the last write
+        """
+        if not (self._dirty or force):
+            return
+        save_dict_cache(self.dict_caches, self.config)
+        self._last_write = time.monotonic()
+        self._dirty = False
@@ -7,6 +7,7 @@ This module centralizes all LLM-related functionality:
 """
 
 import os
+import string
 
 from dotenv import load_dotenv
 from langchain.agents import create_agent
@@ -23,7 +24,67 @@ logger = get_logger(__name__)
 # SECTION 1: Prompt Templates
 # ============================================================================
 
-EXTRACTION_PROMPT = r"""
+
+class PromptTemplate:
+    """A ``str.format``-style prompt template parsed once at import.
+
+    ``str.format`` re-scans the whole template on every call; the prompts
+    here are several KB and rendered once per document or field. Parsing
+    up front leaves only a join of literal chunks and substituted values.
+    Doubled braces (``{{``/``}}``) are literal braces, as with ``str.format``.
+
+    Example:
+        >>> prompt = PromptTemplate("Extract {field} from: {text}")
+        >>> prompt.format(field="nome", text="Nome JOANA")
+        'Extract nome from: Nome JOANA'
+    """
+
+    __slots__ = ("template", "_parts")
+
+    _CONVERSIONS = {"r": repr, "s": str, "a": ascii}
+
+    def __init__(self, template: str):
+        """Parse the template into literal chunks and replacement fields.
+
+        Args:
+            template: Template text using ``{name}`` replacement fields
+
+        Raises:
+            ValueError: If a field is positional, uses attribute/index access
+                or has a nested format spec
+        """
+        self.template = template
+        self._parts = []
+        for literal, name, format_spec, conversion in string.Formatter().parse(
+            template
+        ):
+            if name is not None and (not name.isidentifier() or "{" in format_spec):
+                raise ValueError(f"Unsupported template field: {{{name}}}")
+            self._parts.append((literal, name, format_spec, conversion))
+
+    def format(self, **kwargs) -> str:
+        """Render the template, like ``template.format(**kwargs)``.
+
+        Raises:
+            KeyError: If a replacement field has no matching keyword
+        """
+        chunks = []
+        for literal, name, format_spec, conversion in self._parts:
+            chunks.append(literal)
+            if name is not None:
+                value = kwargs[name]
+                if conversion:
+                    value = self._CONVERSIONS[conversion](value)
+                chunks.append(format(value, format_spec))
+        return "".join(chunks)
+
+    def __str__(self) -> str:
+        """Return the raw template text."""
+        return self.template
+
+
+EXTRACTION_PROMPT = PromptTemplate(
+    r"""
 You are a text extraction robot. Your task is to extract information from the `Input text` according to the `Extraction Schema`.
 
 ---
@@ -57,530 +118,10 @@ Schema: {{"categoria": "Categoria, pode ser ADVOGADO, ADVOGADA, SUPLEMENTAR, EST
 ❌ Incorrect: {{"categoria": "Endereco Profissional"}}
 ---
 """
+)
 
-RULE_GENERATION_PROMPT_NO_OTHER_KEYWORDS = r"""
-You are an expert automation engineer specializing in **robust text extraction** from semi-structured documents.
-Your task is to generate **a single, robust regex extraction rule** for a specific data field.
-
-The goal is to create an **atomic rule** that reliably finds this value in future documents.
-The rule MUST be based on **stable anchor keywords** (like "Inscrição", "Endereço Profissional") or patterns directly related to the field itself.
-
------
-
-**SYSTEM-LEVEL ROBUSTNESS REQUIREMENTS**
-
-1.  **Stable Anchors Only:** Rules must rely on stable textual anchors (labels or keywords), **never visual layout, indentation, or order**.
-2.  **Cross-Field Independence:** Each rule must work independently, even if other fields are missing or reordered.
-3.  **Invariant to spacing, capitalization, and accents:** Regex should be case-insensitive (`(?i)`) and tolerant to minor spacing or punctuation variations.
-4.  **Anchor Proximity:** Capture text **within 1-2 lines of the anchor**, not from distant parts of the document.
-5.  **No Document-Specific Values:** Avoid hardcoding specific values from the current document.
-
------
-
-**CRUCIAL CONSTRAINTS: WHAT TO AVOID**
-
-1.  **Keyword vs. Value Confusion**
-    * Extraction Rule must capture the **value**, not the anchor.
-    * Bad: `(Situação)` → matches anchor, not value.
-    * Good: `Situação\s+([^\n]+)` → captures the actual value.
-
-2.  **Permissive Validation**
-    * `validation_regex` must be specific and fail on contamination from other fields.
-    * Bad: `^[A-Z\s]+$` → would match unrelated field text.
-    * Good: `^(?!.*(?i:{{other_keywords_joined}}))[A-ZÀ-ÖØ-öø-ÿ''\-\s]{{2,120}}$`
-
------
-
-**HANDLING NULL FIELDS (Empty String Values)**
-
-When `field_value` is an empty string `""`, the field is null/empty in the document.
-
-**CRITICAL UNDERSTANDING:**
-A null field means the field's label/keyword exists BUT has no value before the next field.
-The regex must **verify the absence of content**, not just capture an empty group.
-
-**Your Task:**
-Create a regex that:
-1.  Finds the field's label/keyword
-2.  Skips any whitespace/newlines after it
-3.  **Verifies** that what follows is either:
-    * Another field's keyword (from `other_keywords`)
-    * End of text `$`
-4.  Captures empty string `()` to indicate null
-
-**REGEX PATTERN STRUCTURE FOR NULL FIELDS:**
-```
-
-(?i)FieldLabel[\\s\\n]*()(?=[\\s\\n]*(?:NextKeyword1|NextKeyword2|...|$))
-
-```
-
-**COMPONENTS EXPLAINED:**
-- `(?i)` - Case insensitive matching (optional but recommended)
-- `FieldLabel` - The exact field label/keyword (e.g., "Categoria", "Inscricao")
-- `[\s\n]*` - Skip any whitespace/newlines after label
-- `()` - Empty capture group that returns ""
-- `(?=...)` - **MANDATORY LOOKAHEAD** - verifies what comes next WITHOUT consuming it
-- `[\s\n]*` - INSIDE lookahead: skip whitespace before checking next keyword
-- `(?:NextKeyword1|NextKeyword2|...)` - Non-capturing group with all next field keywords
-- `$` - End of text (for last field case)
-
-**CRITICAL: The lookahead has TWO parts:**
-1.  `[\s\n]*` - Skip whitespace inside the lookahead
-2.  `(?:Keyword1|Keyword2|...)` - Check if next non-whitespace text is a keyword
-
-This handles cases like: `Nome   \n\n   Inscricao` (whitespace between fields)
-
-**WHY LOOKAHEAD IS MANDATORY:**
-Without lookahead, `Categoria\s*()` would match even if there's content:
-```
-
-Bad: "Categoria\\nADVOGADO" → matches and returns "" (WRONG\!)
-Good: "Categoria[\\s\\n]*()(?=[\\s\\n]*(?:Endereco|$))" → NO match because ADVOGADO follows
-
-```
-
-The lookahead with `[\s\n]*` inside handles whitespace-only gaps:
-```
-
-"Nome   \\n   Inscricao" → lookahead skips whitespace, finds "Inscricao" → Match ✓
-"Nome123Inscricao" → lookahead finds "123", not "Inscricao" → NO match ✓
-
-````
-
-**EDGE CASES YOU MUST HANDLE:**
-
-1.  **Field is in the middle of document (normal case):**
-    ```
-    Text: "Categoria\nEndereco Profissional: Rua ABC"
-    Rule: "(?i)Categoria[\s\n]*()(?=Endereco|Telefone|...|$)"
-    Result: Matches ✓ (truly null)
-    ```
-
-2.  **Field is the LAST field in document:**
-    ```
-    Text: "...Telefone: 123456\nCategoria"
-    Rule: "(?i)Categoria[\s\n]*()(?=Endereco|Telefone|...|$)"
-    Result: Matches via $ ✓ (truly null, last field)
-    ```
-
-3.  **Field label exists but HAS content (should NOT match):**
-    ```
-    Text: "Categoria\nADVOGADO\nEndereco: Rua ABC"
-    Rule: "(?i)Categoria[\s\n]*()(?=Endereco|Telefone|...|$)"
-    Result: NO match ✗ (has value "ADVOGADO", not in lookahead list)
-    ```
-
-4.  **Multiple whitespaces/newlines between null field and next:**
-    ```
-    Text: "Categoria\n\n\nEndereco: Rua ABC"
-    Rule: "(?i)Categoria[\s\n]*()(?=[\s\n]*(?:Endereco|Telefone|...|$))"
-    Result: Matches ✓ ([\s\n]* in lookahead handles multiple whitespace)
-    ```
-
-5.  **Content between field label and next field (should NOT match):**
-    ```
-    Text: "Nome123231Inscricao: 456789"
-    Rule: "(?i)Nome[\s\n]*()(?=[\s\n]*(?:Inscricao|Categoria|...|$))"
-    Result: NO match ✗ (lookahead finds "123231", not "Inscricao")
-    Explanation: After "Nome", lookahead skips whitespace (none here),
-    then checks if next chars match keywords. Finds "1" instead → fails.
-    ```
-
-**BUILDING THE LOOKAHEAD - CRITICAL RULES:**
-
-1.  **Include EVERY field keyword** from `other_keywords`:
-    * If other_keywords = ['nome', 'inscricao', 'endereco', 'telefone']
-    * Lookahead: `(?=nome|inscricao|endereco|telefone|$)`
-
-2.  **Use case-insensitive matching** in lookahead when possible:
-    * `(?=(?i:nome|inscricao|endereco)|$)`
-    * OR use `(?i)` at start of full pattern
-
-3.  **ALWAYS include `$`** at the end for last-field case
-
-4.  **Match the EXACT keyword form** as it appears in text:
-    * If text has "Endereço Profissional", use that exact string
-    * Better: use partial match like `(?=Endere|Telefone|$)`
-
-**EXAMPLE RULE FOR NULL FIELD:**
-{{
-  "rule": "(?i)Categoria[\\s\\n]*()(?=[\\s\\n]*(?:Endereco|Telefone|Inscricao|Nome|$))",
-  "validation_regex": "^$"
-}}
-
-**This pattern:**
-- `(?i)` - Case insensitive
-- `Categoria` - Finds the field label
-- `[\\s\\n]*` - Skips any whitespace/newlines after label
-- `()` - Captures empty string
-- `(?=[\\s\\n]*(?:Endereco|Telefone|Inscricao|Nome|$))` - **VERIFIES** next field or end
-  - First `[\\s\\n]*` inside lookahead skips whitespace
-  - Then `(?:...)` checks if next non-whitespace is a keyword or end
-- **ONLY matches when field is truly empty** (no content between label and next keyword)
-
-**WHAT HAPPENS IN EXECUTION:**
-1.  Regex finds "Categoria"
-2.  Skips whitespace
-3.  Lookahead checks: "Is next character start of another field keyword or end?"
-4.  If YES → Match succeeds, capture group returns ""
-5.  If NO → Match fails, returns None (field has a value)
-
------
-
-**INPUTS**
-
-1.  **Full Text (`full_text`):**
-    {text}
-
-2.  **Field to Analyze (`field_name`):**
-    "{field_name}"
-
-3.  **Extracted Value (`field_value`):**
-    "{field_value}"
-    (Note: Empty string "" means the field is null/empty)
-
-4.  **Field Description (`field_description`):**
-    "{field_description}"
-
-5.  **Other Field Keywords to Exclude (`other_keywords`):**
-    {other_keywords}
-
------
-
-**OUTPUT INSTRUCTIONS**
-
-  - Both `"rule"` and `"validation_regex"` are mandatory.
-  - Extraction regex **must include a capture group `( )` for the value**.
-  - For null fields (empty string value), use an empty capture group `()`.
-
-**Rule Schema**
-{{
-  "rule": "Python-compatible regex pattern capturing only the value",
-  "validation_regex": "Regex to validate the value format (use ^$ for empty strings)"
-}}
-
------
-
-**EXAMPLES**
-
-1.  **Normal Field (with value)**
-
-  * field_name: "inscricao"
-  * field_value: "101943"
-  * other_keywords: ['nome','seccional','subsecao','categoria','situacao']
-    {{
-      "rule": "Inscrição[^\\\\d]\*(\\d{{6}})",
-      "validation_regex": "^\\d{{6}}$"
-    }}
-
-2.  **Null Field (empty value)**
-
-  * field_name: "categoria"
-  * field_value: "" (empty string)
-  * other_keywords: ['nome','inscricao','seccional','subsecao','situacao']
-    {{
-      "rule": "(?i)Categoria[\\\\s\\\\n]*()(?=[\\\\s\\\\n]*(?:Nome|Inscricao|Seccional|Subsecao|Situacao|$))",
-      "validation_regex": "^$"
-    }}
-    Explanation:
-    - `(?i)` makes matching case-insensitive
-    - `Categoria` finds the field label
-    - `[\\\\s\\\\n]*` skips any whitespace/newlines after label
-    - `()` captures empty string
-    - `(?=[\\\\s\\\\n]*(?:Nome|Inscricao|...))` lookahead with inner whitespace skip
-    - Handles: "Categoria\n\nNome" ✓, "Categoria123Nome" ✗ (has content)
-
------
-
-**Your Turn**
-
-Generate the extraction rule for the field `"{field_name}"`.
-
-**FOR NULL FIELDS (field_value = ""):**
-You MUST create a regex that:
-1.  Uses case-insensitive flag: `(?i)`
-2.  Finds the field label (use capitalized form as it appears in text)
-3.  Skips whitespace after label: `[\\s\\n]*`
-4.  Captures empty: `()`
-5.  **MANDATORY LOOKAHEAD** with structure: `(?=[\\s\\n]*(?:Keyword1|Keyword2|...|$))`
-    -   The `[\\s\\n]*` INSIDE lookahead is crucial
-    -   It allows whitespace between label and next keyword
-    -   Without it, "Nome   Inscricao" wouldn't match (has spaces)
-6.  validation_regex: `^$`
-
-**Pattern Template:**
-`(?i)FieldLabel[\\s\\n]*()(?=[\\s\\n]*(?:NextField1|NextField2|NextField3|...|$))`
-
-**CRITICAL:**
--   The lookahead has TWO parts: `[\\s\\n]*` then `(?:keywords|$)`
--   This handles whitespace-only gaps between fields
--   Must include ALL keywords from `other_keywords`
--   Detects "Nome  Inscricao" as null ✓, "Nome123Inscricao" as non-null ✗
-"""
-
-# RULE_GENERATION_PROMPT = r"""
-# You are an expert automation engineer specializing in **robust text extraction** from semi-structured documents.
-# Your task is to generate **a single, robust regex extraction rule** for a specific data field.
-
-# The goal is to create an **atomic rule** that reliably finds this value in future documents.
-# The rule MUST be based on **stable anchor keywords** (like "Inscrição", "Endereço Profissional") or patterns directly related to the field itself.
-
-# -----
-
-# **SYSTEM-LEVEL ROBUSTNESS REQUIREMENTS**
-
-# 1.  **Stable Anchors Only:** Rules must rely on stable textual anchors (labels or keywords), **never visual layout, indentation, or order**.
-# 2.  **Cross-Field Independence:** Each rule must work independently, even if other fields are missing or reordered.
-# 3.  **Invariant to spacing, capitalization, and accents:** Regex should be case-insensitive (`(?i)`) and tolerant to minor spacing or punctuation variations.
-# 4.  **Anchor Proximity:** Capture text **within 1-2 lines of the anchor**, not from distant parts of the document.
-# 5.  **No Document-Specific Values:** Avoid hardcoding specific values from the current document.
-
-# -----
-
-# **CRUCIAL CONSTRAINTS: WHAT TO AVOID**
-
-# 1.  **Keyword vs. Value Confusion**
-#     * Extraction Rule must capture the **value**, not the anchor.
-#     * Bad: `(Situação)` → matches anchor, not value.
-#     * Good: `Situação\s+([^\n]+)` → captures the actual value.
-
-# 2.  **Permissive Validation**
-#     * `validation_regex` must be specific and fail on contamination from other fields.
-#     * Bad: `^[A-Z\s]+$` → would match unrelated field text.
-#     * Good: `^(?!.*(?i:{{other_keywords_joined}}))[A-ZÀ-ÖØ-öø-ÿ''\-\s]{{2,120}}$`
-
-# -----
-
-# **HANDLING NULL FIELDS (Empty String Values)**
-
-# When `field_value` is an empty string `""`, the field is null/empty in the document.
-
-# **CRITICAL UNDERSTANDING:**
-# A null field means the field's label/keyword exists BUT has no value before the next field.
-# The regex must **verify the absence of content**, not just capture an empty group.
-
-# **Your Task:**
-# Create a regex that:
-# 1.  Finds the field's label/keyword
-# 2.  Skips any whitespace/newlines after it
-# 3.  **Verifies** that what follows is either:
-#     * Another field's keyword (from `other_keywords`)
-#     * End of text `$`
-# 4.  Captures empty string `()` to indicate null
-
-# **REGEX PATTERN STRUCTURE FOR NULL FIELDS:**
-# ```
-
-# (?i)FieldLabel[\\s\\n]*()(?=[\\s\\n]*(?:NextKeyword1|NextKeyword2|...|$))
-
-# ```
-
-# **COMPONENTS EXPLAINED:**
-# - `(?i)` - Case insensitive matching (optional but recommended)
-# - `FieldLabel` - The exact field label/keyword (e.g., "Categoria", "Inscricao")
-# - `[\s\n]*` - Skip any whitespace/newlines after label
-# - `()` - Empty capture group that returns ""
-# - `(?=...)` - **MANDATORY LOOKAHEAD** - verifies what comes next WITHOUT consuming it
-# - `[\s\n]*` - INSIDE lookahead: skip whitespace before checking next keyword
-# - `(?:NextKeyword1|NextKeyword2|...)` - Non-capturing group with all next field keywords
-# - `$` - End of text (for last field case)
-
-# **CRITICAL: The lookahead has TWO parts:**
-# 1.  `[\s\n]*` - Skip whitespace inside the lookahead
-# 2.  `(?:Keyword1|Keyword2|...)` - Check if next non-whitespace text is a keyword
-
-# This handles cases like: `Nome   \n\n   Inscricao` (whitespace between fields)
-
-# **WHY LOOKAHEAD IS MANDATORY:**
-# Without lookahead, `Categoria\s*()` would match even if there's content:
-# ```
-
-# Bad: "Categoria\\nADVOGADO" → matches and returns "" (WRONG\!)
-# Good: "Categoria[\\s\\n]*()(?=[\\s\\n]*(?:Endereco|$))" → NO match because ADVOGADO follows
-
-# ```
-
-# The lookahead with `[\s\n]*` inside handles whitespace-only gaps:
-# ```
-
-# "Nome   \\n   Inscricao" → lookahead skips whitespace, finds "Inscricao" → Match ✓
-# "Nome123Inscricao" → lookahead finds "123", not "Inscricao" → NO match ✓
-
-# ````
-
-# **EDGE CASES YOU MUST HANDLE:**
-
-# 1.  **Field is in the middle of document (normal case):**
-#     ```
-#     Text: "Categoria\nEndereco Profissional: Rua ABC"
-#     Rule: "(?i)Categoria[\s\n]*()(?=Endereco|Telefone|...|$)"
-#     Result: Matches ✓ (truly null)
-#     ```
-
-# 2.  **Field is the LAST field in document:**
-#     ```
-#     Text: "...Telefone: 123456\nCategoria"
-#     Rule: "(?i)Categoria[\s\n]*()(?=Endereco|Telefone|...|$)"
-#     Result: Matches via $ ✓ (truly null, last field)
-#     ```
-
-# 3.  **Field label exists but HAS content (should NOT match):**
-#     ```
-#     Text: "Categoria\nADVOGADO\nEndereco: Rua ABC"
-#     Rule: "(?i)Categoria[\s\n]*()(?=Endereco|Telefone|...|$)"
-#     Result: NO match ✗ (has value "ADVOGADO", not in lookahead list)
-#     ```
-
-# 4.  **Multiple whitespaces/newlines between null field and next:**
-#     ```
-#     Text: "Categoria\n\n\nEndereco: Rua ABC"
-#     Rule: "(?i)Categoria[\s\n]*()(?=[\s\n]*(?:Endereco|Telefone|...|$))"
-#     Result: Matches ✓ ([\s\n]* in lookahead handles multiple whitespace)
-#     ```
-
-# 5.  **Content between field label and next field (should NOT match):**
-#     ```
-#     Text: "Nome123231Inscricao: 456789"
-#     Rule: "(?i)Nome[\s\n]*()(?=[\s\n]*(?:Inscricao|Categoria|...|$))"
-#     Result: NO match ✗ (lookahead finds "123231", not "Inscricao")
-#     Explanation: After "Nome", lookahead skips whitespace (none here),
-#     then checks if next chars match keywords. Finds "1" instead → fails.
-#     ```
-
-# **BUILDING THE LOOKAHEAD - CRITICAL RULES:**
-
-# 1.  **Include EVERY field keyword** from `other_keywords`:
-#     * If other_keywords = ['nome', 'inscricao', 'endereco', 'telefone']
-#     * Lookahead: `(?=nome|inscricao|endereco|telefone|$)`
-
-# 2.  **Use case-insensitive matching** in lookahead when possible:
-#     * `(?=(?i:nome|inscricao|endereco)|$)`
-#     * OR use `(?i)` at start of full pattern
-
-# 3.  **ALWAYS include `$`** at the end for last-field case
-
-# 4.  **Match the EXACT keyword form** as it appears in text:
-#     * If text has "Endereço Profissional", use that exact string
-#     * Better: use partial match like `(?=Endere|Telefone|$)`
-
-# **EXAMPLE RULE FOR NULL FIELD:**
-# {{
-#   "rule": "(?i)Categoria[\\s\\n]*()(?=[\\s\\n]*(?:Endereco|Telefone|Inscricao|Nome|$))",
-#   "validation_regex": "^$"
-# }}
-
-# **This pattern:**
-# - `(?i)` - Case insensitive
-# - `Categoria` - Finds the field label
-# - `[\\s\\n]*` - Skips any whitespace/newlines after label
-# - `()` - Captures empty string
-# - `(?=[\\s\\n]*(?:Endereco|Telefone|Inscricao|Nome|$))` - **VERIFIES** next field or end
-#   - First `[\\s\\n]*` inside lookahead skips whitespace
-#   - Then `(?:...)` checks if next non-whitespace is a keyword or end
-# - **ONLY matches when field is truly empty** (no content between label and next keyword)
-
-# **WHAT HAPPENS IN EXECUTION:**
-# 1.  Regex finds "Categoria"
-# 2.  Skips whitespace
-# 3.  Lookahead checks: "Is next character start of another field keyword or end?"
-# 4.  If YES → Match succeeds, capture group returns ""
-# 5.  If NO → Match fails, returns None (field has a value)
-
-# -----
-
-# **INPUTS**
-
-# 1.  **Full Text (`full_text`):**
-#     {text}
-
-# 2.  **Field to Analyze (`field_name`):**
-#     "{field_name}"
-
-# 3.  **Extracted Value (`field_value`):**
-#     "{field_value}"
-#     (Note: Empty string "" means the field is null/empty)
-
-# 4.  **Field Description (`field_description`):**
-#     "{field_description}"
-
-# 5.  **Other Field Keywords to Exclude (`other_keywords`):**
-#     {other_keywords}
-
-# -----
-
-# **OUTPUT INSTRUCTIONS**
-
-#   - Both `"rule"` and `"validation_regex"` are mandatory.
-#   - Extraction regex **must include a capture group `( )` for the value**.
-#   - For null fields (empty string value), use an empty capture group `()`.
-
-# **Rule Schema**
-# {{
-#   "rule": "Python-compatible regex pattern capturing only the value",
-#   "validation_regex": "Regex to validate the value format (use ^$ for empty strings)"
-# }}
-
-# -----
-
-# **EXAMPLES**
-
-# 1.  **Normal Field (with value)**
-
-#   * field_name: "inscricao"
-#   * field_value: "101943"
-#   * other_keywords: ['nome','seccional','subsecao','categoria','situacao']
-#     {{
-#       "rule": "Inscrição[^\\\\d]\*(\\d{{6}})",
-#       "validation_regex": "^\\d{{6}}$"
-#     }}
-
-# 2.  **Null Field (empty value)**
-
-#   * field_name: "categoria"
-#   * field_value: "" (empty string)
-#   * other_keywords: ['nome','inscricao','seccional','subsecao','situacao']
-#     {{
-#       "rule": "(?i)Categoria[\\\\s\\\\n]*()(?=[\\\\s\\\\n]*(?:Nome|Inscricao|Seccional|Subsecao|Situacao|$))",
-#       "validation_regex": "^$"
-#     }}
-#     Explanation:
-#     - `(?i)` makes matching case-insensitive
-#     - `Categoria` finds the field label
-#     - `[\\\\s\\\\n]*` skips any whitespace/newlines after label
-#     - `()` captures empty string
-#     - `(?=[\\\\s\\\\n]*(?:Nome|Inscricao|...))` lookahead with inner whitespace skip
-#     - Handles: "Categoria\n\nNome" ✓, "Categoria123Nome" ✗ (has content)
-
-# -----
-
-# **Your Turn**
-
-# Generate the extraction rule for the field `"{field_name}"`.
-
-# **FOR NULL FIELDS (field_value = ""):**
-# You MUST create a regex that:
-# 1.  Uses case-insensitive flag: `(?i)`
-# 2.  Finds the field label (use capitalized form as it appears in text)
-# 3.  Skips whitespace after label: `[\\s\\n]*`
-# 4.  Captures empty: `()`
-# 5.  **MANDATORY LOOKAHEAD** with structure: `(?=[\\s\\n]*(?:Keyword1|Keyword2|...|$))`
-#     -   The `[\\s\\n]*` INSIDE lookahead is crucial
-#     -   It allows whitespace between label and next keyword
-#     -   Without it, "Nome   Inscricao" wouldn't match (has spaces)
-# 6.  validation_regex: `^$`
-
-# **Pattern Template:**
-# `(?i)FieldLabel[\\s\\n]*()(?=[\\s\\n]*(?:NextField1|NextField2|NextField3|...|$))`
-
-# **CRITICAL:**
-# -   The lookahead has TWO parts: `[\\s\\n]*` then `(?:keywords|$)`
-# -   This handles whitespace-only gaps between fields
-# -   Must include ALL keywords from `other_keywords`
-# -   Detects "Nome  Inscricao" as null ✓, "Nome123Inscricao" as non-null ✗
-# """
-
-RULE_GENERATION_PROMPT = r"""
+RULE_GENERATION_PROMPT = PromptTemplate(
+    r"""
 You are an expert automation engineer specializing in **robust text extraction** from semi-structured documents.
 Your task is to generate **a single, robust regex extraction rule** for a specific data field.
 
@@ -840,13 +381,23 @@ You MUST create a regex that:
 -  Must include ALL keywords from `other_keywords`
 -  Detects "Nome Inscricao" as null ✓, "Nome123Inscricao" as non-null ✗
 """
+)
 
 # ============================================================================
 # SECTION 2: Model Initialization
 # ============================================================================
 
 
-def init_model(max_retries: int = 0, timeout: int = 30):
+# Default request timeout per model, in seconds. Set a little above each
+# model's usual latency on these prompts, so a stalled request is abandoned
+# and retried (see ``max_retries``) instead of holding up the document.
+MODEL_TIMEOUTS = {
+    "gpt-5-mini": 20,
+    "gemini-2.5-flash": 30,
+}
+
+
+def init_model(max_retries: int = 0, timeout: int | None = None):
     """Initialize LLM model based on available API keys.
 
     Checks for OPENAI_API_KEY and GEMINI_API_KEY environment variables
@@ -854,7 +405,8 @@ def init_model(max_retries: int = 0, timeout: int = 30):
 
     Args:
         max_retries: Maximum number of retries for API calls.
-        timeout: Timeout for API calls in seconds.
+        timeout: Timeout for API calls in seconds (default: the model's
+            entry in ``MODEL_TIMEOUTS``).
 
     Returns:
         Initialized chat model instance.
@@ -869,7 +421,7 @@ def init_model(max_retries: int = 0, timeout: int = 30):
             model_provider="openai",
             api_key=os.getenv("OPENAI_API_KEY"),
             max_retries=max_retries,
-            timeout=timeout,
+            timeout=timeout or MODEL_TIMEOUTS["gpt-5-mini"],
         )
     elif os.getenv("GEMINI_API_KEY"):
         logger.debug("Initializing Gemini model")
@@ -879,7 +431,7 @@ def init_model(max_retries: int = 0, timeout: int = 30):
             model_provider="google_genai",
             api_key=os.getenv("GEMINI_API_KEY"),
             max_retries=max_retries,
-            timeout=timeout,
+            timeout=timeout or MODEL_TIMEOUTS["gemini-2.5-flash"],
         )
     else:
         raise ValueError(
@@ -7,16 +7,31 @@ import sys
 # Global log level that can be set before creating loggers
 _GLOBAL_LOG_LEVEL = logging.INFO
 
+# INFO highlight patterns, compiled once instead of on every record
+_SIZE_RE = re.compile(r"(\d+\.?\d*\s*(?:GB|MB|%|docs))")
+_SHARD_RE = re.compile(r"(Shard \d+)")
+# Substrings every _SIZE_RE match contains, checked before running the regex
+_SIZE_UNITS = ("GB", "MB", "%", "docs")
+
 
 def set_global_log_level(level):
     """Set the global log level for all loggers created afterwards.
 
+    Also turns off the thread and process info that logging collects for
+    every record, since the log format has no such fields. This is
+    process-wide, so it happens here (called by the CLI entry point) rather
+    than when the module is imported.
+
     Args:
         level: Logging level (logging.DEBUG, logging.INFO, etc.)
     """
     global _GLOBAL_LOG_LEVEL
     _GLOBAL_LOG_LEVEL = level
 
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
     # Update all existing loggers
     for logger_name in logging.Logger.manager.loggerDict:
         existing_logger = logging.getLogger(logger_name)
@@ -39,6 +54,8 @@ class ColoredFormatter(logging.Formatter):
     }
     RESET = "\033[0m"
     BOLD = "\033[1m"
+    SIZE_HIGHLIGHT = f"{BOLD}\\1{RESET}"
+    SHARD_HIGHLIGHT = f"{COLORS['INFO']}{BOLD}\\1{RESET}"
 
     def format(self, record):
         # Add color to the level name
@@ -51,17 +68,11 @@ class ColoredFormatter(logging.Formatter):
         message = super().format(record)
         # Add color to specific parts of the message
         if levelname == "INFO":
-            # Highlight numbers and percentages
-            message = re.sub(
-                r"(\d+\.?\d*\s*(?:GB|MB|%|docs))",
-                rf"{self.BOLD}\1{self.RESET}",
-                message,
-            )
-            message = re.sub(
-                r"(Shard \d+)",
-                rf"{self.COLORS['INFO']}{self.BOLD}\1{self.RESET}",
-                message,
-            )
+            # Highlight numbers and percentages (most messages have neither)
+            if any(unit in message for unit in _SIZE_UNITS):
+                message = _SIZE_RE.sub(self.SIZE_HIGHLIGHT, message)
+            if "Shard " in message:
+                message = _SHARD_RE.sub(self.SHARD_HIGHLIGHT, message)
         return message
 
 
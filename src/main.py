@@ -4,17 +4,24 @@ This is the entry point for the adaptive PDF extraction system.
 It orchestrates the entire extraction workflow using modular components.
 """
 
+import cProfile
 import logging
 import time
 from collections import defaultdict
+from typing import Literal
 
 import tyro
 from dotenv import load_dotenv
 from pydantic import BaseModel, DirectoryPath, Field
 
 import wandb
-from cache import Cache, load_dict_cache_json, save_dict_cache
-from data import create_pydantic_model, format_dict, process_dataset, read_dataset
+from cache import Cache, CacheWriter, load_dict_cache_json
+from data import (
+    create_pydantic_model,
+    format_dict,
+    iter_process_dataset,
+    read_dataset,
+)
 from llm import (
     EXTRACTION_PROMPT,
     create_extraction_agent,
@@ -91,7 +98,14 @@ class Args(BaseModel):
     )
     save_cache_disk: bool = Field(
         default=True,
-        description="Save cache to disk as JSON file after each rule generation.",
+        description="Save cache to disk as JSON file during the run and at the end.",
+    )
+    cache_save_interval: float = Field(
+        default=2.0,
+        ge=0,
+        description="Minimum seconds between cache saves during the run; saves "
+        "requested in between are coalesced (0 saves after every rule). The "
+        "cache is always saved at the end, also when the run stops early.",
     )
     save_cache_wandb: bool = Field(
         default=True,
@@ -102,21 +116,57 @@ class Args(BaseModel):
         description="Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL).",
     )
     max_retries: int = Field(
-        default=0,
+        default=2,
         ge=0,
         le=10,
         description="Maximum number of retries for LLM API calls.",
     )
-    timeout: int = Field(
-        default=90,
+    timeout: int | None = Field(
+        default=None,
         ge=5,
         le=120,
-        description="Timeout for each LLM API calls in seconds.",
+        description="Timeout for each LLM API calls in seconds (default: tuned "
+        "per model, see llm.MODEL_TIMEOUTS).",
     )
     use_cache: bool = Field(
         default=True,
         description="Enable cache-based extraction. Disable for LLM-only mode.",
     )
+    rule_workers: int = Field(
+        default=1,
+        ge=1,
+        le=16,
+        description="Maximum concurrent rule-generation LLM calls per document "
+        "(one per field). Keep at 1 if the API is rate limited.",
+    )
+    rule_context_chars: int | None = Field(
+        default=None,
+        ge=1,
+        description="Send only this many characters around each value to the "
+        "rule-generation LLM instead of the whole document (fewer prompt "
+        "tokens). Rules are still validated on the full text.",
+    )
+    rule_prompt_cache: bool = Field(
+        default=False,
+        description="Store generated rules in <data_folder>/.cache/rules, keyed "
+        "by prompt hash, and reuse them for identical prompts on later runs "
+        "instead of calling the LLM.",
+    )
+    pdf_backend: Literal["pypdf2", "pdfium"] = Field(
+        default="pypdf2",
+        description="PDF text extraction backend. 'pdfium' (needs pypdfium2) is "
+        "faster but may order text differently than the rules were learned on.",
+    )
+    pdf_text_cache: bool = Field(
+        default=False,
+        description="Cache extracted PDF text in <data_folder>/.cache, keyed by "
+        "file hash, so unchanged PDFs are not parsed again on later runs.",
+    )
+    profile: str | None = Field(
+        default=None,
+        description="Profile the run with cProfile and write the stats to this "
+        "path (view with snakeviz or convert to a flamegraph with flameprof).",
+    )
 
 
 # ============================================================================
@@ -143,13 +193,24 @@ def main(args: Args):
     model = init_model(max_retries=config.max_retries, timeout=config.timeout)
     logger.info("LLM model initialized successfully")
 
-    # Load and process dataset
+    # Load dataset. Entries are processed lazily: PDF text is extracted in
+    # background processes, so later PDFs are parsed while earlier documents
+    # wait on the LLM.
     dataset = read_dataset(config.dataset_filename, config.data_folder)
-    processed_dataset = process_dataset(dataset, config.data_folder)
-    logger.info("Dataset loaded and processed: %d documents", len(processed_dataset))
+    num_docs = len(dataset)
+    processed_dataset = iter_process_dataset(
+        dataset,
+        config.data_folder,
+        pdf_backend=config.pdf_backend,
+        text_cache_dir=(
+            str(config.data_folder / ".cache") if config.pdf_text_cache else None
+        ),
+    )
+    logger.info("Dataset loaded: %d documents", num_docs)
 
     # Initialize cache system (one cache per document label/type)
     dict_caches = defaultdict(Cache)
+    cache_writer = CacheWriter(dict_caches, config, config.cache_save_interval)
 
     # Load global cache if provided and cache is enabled
     if config.use_cache and config.cache_filename:
@@ -175,229 +236,262 @@ def main(args: Args):
     # Collect all answers for final save
     all_answers = []
 
-    # Process each document in the dataset
-    for doc_idx, data in enumerate(processed_dataset, 1):
-        start_time = time.time()
+    # LLM agents are built on first use and reused across documents. Pydantic
+    # models are cached per schema, so documents missing the same fields
+    # share one extraction agent.
+    extraction_agents = {}
+    agent_rule = None
 
-        text_data = data.get("pdf_text", "")
-        all_fields = list(data["extraction_schema"].keys())
+    # Rules across all label caches, updated as caches are adopted and rules
+    # are generated instead of recounted after every document
+    global_rule_count = 0
 
-        logger.info("=" * 80)
-        logger.info(
-            "Processing document %d/%d - Label: '%s'",
-            doc_idx,
-            len(processed_dataset),
-            data["label"],
-        )
+    # Process each document in the dataset. The cleanup below runs even if
+    # the loop stops early (LLM error, Ctrl-C): rules generated since the
+    # last debounced save are written, and PDF extractions still queued in
+    # the background are cancelled instead of delaying exit.
+    try:
+        for doc_idx, data in enumerate(processed_dataset, 1):
+            start_time = time.time()
 
-        # Use loaded cache for this label (only on first encounter)
-        if global_loaded_cache and data["label"] not in dict_caches:
-            dict_caches[data["label"]] = global_loaded_cache[data["label"]]
-            logger.debug("Using loaded cache for label '%s'", data["label"])
-
-        label_cache = dict_caches[data["label"]]
-
-        # ====================================================================
-        # STEP 1: Cache-Based Extraction (Fast Path)
-        # ====================================================================
-
-        ans = {}
-        success_fields = []
-        failed_fields = []
-
-        if config.use_cache:
-            # Try cache-based extraction first
-            ans, success_fields, failed_fields = extract_with_cache(
-                label_cache, text_data, all_fields
-            )
+            text_data = data.get("pdf_text", "")
+            all_fields = list(data["extraction_schema"].keys())
 
+            logger.info("=" * 80)
             logger.info(
-                "Extraction summary - Success: %d/%d, Failed: %d/%d",
-                len(success_fields),
-                len(all_fields),
-                len(failed_fields),
-                len(all_fields),
-            )
-            logger.debug("Successful fields: %s", success_fields)
-            logger.warning("Failed fields: %s", failed_fields)
-            logger.debug("Extracted values: %s", ans)
-        else:
-            # Cache disabled - all fields need LLM extraction
-            logger.info("Cache disabled - using LLM-only extraction mode")
-            failed_fields = all_fields.copy()
-
-        # ====================================================================
-        # STEP 2: LLM Extraction for Failed Fields (Slow Path)
-        # ====================================================================
-
-        doc_prompt_tokens = 0
-        doc_completion_tokens = 0
-        llm1_calls = 0
-        llm2_calls = 0
-        new_rules_added = 0
-
-        if failed_fields:
-            logger.info("Extracting %d failed fields using LLM", len(failed_fields))
-
-            # Create dynamic Pydantic model for failed fields only
-            failed_schema = {f: data["extraction_schema"][f] for f in failed_fields}
-            pydantic_model = create_pydantic_model(failed_schema)
-
-            # Create extraction agent
-            agent = create_extraction_agent(model, pydantic_model)
-
-            # Extract with LLM
-            (
-                llm_extracted,
-                extraction_success,
-                extractor_prompt_toks,
-                extractor_completion_toks,
-            ) = extract_with_llm(
-                agent,
-                text_data,
-                data["extraction_schema"],
-                failed_fields,
-                EXTRACTION_PROMPT,
+                "Processing document %d/%d - Label: '%s'",
+                doc_idx,
+                num_docs,
+                data["label"],
             )
-            ans.update(llm_extracted)
-            doc_prompt_tokens += extractor_prompt_toks
-            doc_completion_tokens += extractor_completion_toks
-            llm1_calls = 1
 
-            if extraction_success:
-                logger.info("LLM extraction complete:\n%s", format_dict(llm_extracted))
+            # Use loaded cache for this label (only on first encounter)
+            if global_loaded_cache and data["label"] not in dict_caches:
+                dict_caches[data["label"]] = global_loaded_cache[data["label"]]
+                global_rule_count += dict_caches[data["label"]].num_rules
+                logger.debug("Using loaded cache for label '%s'", data["label"])
 
-                # ================================================================
-                # STEP 3: Generate and Cache Rules (only if cache is enabled)
-                # ================================================================
+            label_cache = dict_caches[data["label"]]
 
-                if config.use_cache:
-                    logger.info(
-                        "Generating rules for %d extracted fields", len(llm_extracted)
-                    )
+            # ====================================================================
+            # STEP 1: Cache-Based Extraction (Fast Path)
+            # ====================================================================
 
-                    # Create rule generation agent
-                    agent_rule = create_rule_agent(model, Rule)
-
-                    # Define save callback
-                    # (saves cache immediately to disk after each rule)
-                    def save_cache_callback():
-                        if config.save_cache_disk:
-                            save_dict_cache(dict_caches, config)
-
-                    # Generate rules with validation loop
-                    (
-                        new_rules_added,
-                        rule_prompt_toks,
-                        rule_completion_toks,
-                        llm_calls,
-                    ) = generate_rules_for_fields(
-                        agent_rule,
-                        llm_extracted,
-                        text_data,
-                        data["extraction_schema"],
-                        all_fields,
-                        label_cache,
-                        data["label"],
-                        config.max_attempts,
-                        save_cache_callback,
-                    )
+            ans = {}
+            success_fields = []
+            failed_fields = []
 
-                    doc_prompt_tokens += rule_prompt_toks
-                    doc_completion_tokens += rule_completion_toks
-                    llm2_calls = llm_calls
+            if config.use_cache:
+                # Try cache-based extraction first
+                ans, success_fields, failed_fields = extract_with_cache(
+                    label_cache, text_data, all_fields
+                )
 
-                    logger.info("Generated %d new rules", new_rules_added)
-                else:
-                    logger.debug("Cache disabled - skipping rule generation")
-            else:
-                logger.warning(
-                    "LLM extraction failed (timeout or error). "
-                    "Skipping rule generation for %d fields: %s",
+                logger.info(
+                    "Extraction summary - Success: %d/%d, Failed: %d/%d",
+                    len(success_fields),
+                    len(all_fields),
                     len(failed_fields),
+                    len(all_fields),
+                )
+                logger.debug("Successful fields: %s", success_fields)
+                logger.warning("Failed fields: %s", failed_fields)
+                logger.debug("Extracted values: %s", ans)
+            else:
+                # Cache disabled - all fields need LLM extraction
+                logger.info("Cache disabled - using LLM-only extraction mode")
+                failed_fields = all_fields.copy()
+
+            # ====================================================================
+            # STEP 2: LLM Extraction for Failed Fields (Slow Path)
+            # ====================================================================
+
+            doc_prompt_tokens = 0
+            doc_completion_tokens = 0
+            llm1_calls = 0
+            llm2_calls = 0
+            new_rules_added = 0
+
+            if failed_fields:
+                logger.info("Extracting %d failed fields using LLM", len(failed_fields))
+
+                # Create dynamic Pydantic model for failed fields only
+                failed_schema = {f: data["extraction_schema"][f] for f in failed_fields}
+                pydantic_model = create_pydantic_model(failed_schema)
+
+                # Get (or create) the extraction agent for this set of fields
+                agent = extraction_agents.get(pydantic_model)
+                if agent is None:
+                    agent = create_extraction_agent(model, pydantic_model)
+                    extraction_agents[pydantic_model] = agent
+
+                # Extract with LLM
+                (
+                    llm_extracted,
+                    extraction_success,
+                    extractor_prompt_toks,
+                    extractor_completion_toks,
+                ) = extract_with_llm(
+                    agent,
+                    text_data,
+                    data["extraction_schema"],
                     failed_fields,
+                    EXTRACTION_PROMPT,
                 )
-        else:
-            logger.info("All fields extracted from cache (100%% hit rate)")
-            if config.cache_filename and config.save_cache_disk:
-                save_dict_cache(dict_caches, config)
-                logger.debug("Cache saved after successful full extraction")
-
-        # ====================================================================
-        # STEP 4: Evaluate Performance and Track Metrics
-        # ====================================================================
-
-        elapsed_time = time.time() - start_time
-
-        # Evaluate accuracy if ground truth available
-        accuracy_pct = 0.0
-        if "expected_answer" in data:
-            accuracy_pct = evaluate_performance(ans, data["expected_answer"])
-
-        # Collect answer
-        all_answers.append(
-            {
-                "idx": doc_idx,
-                "label": data["label"],
-                "expected": data.get("expected_answer", {}),
-                "extracted": ans,
-            }
-        )
+                ans.update(llm_extracted)
+                doc_prompt_tokens += extractor_prompt_toks
+                doc_completion_tokens += extractor_completion_toks
+                llm1_calls = 1
+
+                if extraction_success:
+                    # format_dict is slow (pure-Python JSON5), only run it if shown
+                    if logger.isEnabledFor(logging.INFO):
+                        logger.info(
+                            "LLM extraction complete:\n%s", format_dict(llm_extracted)
+                        )
+
+                    # ================================================================
+                    # STEP 3: Generate and Cache Rules (only if cache is enabled)
+                    # ================================================================
+
+                    if config.use_cache:
+                        logger.info(
+                            "Generating rules for %d extracted fields",
+                            len(llm_extracted),
+                        )
+
+                        # Create rule generation agent (once per run)
+                        if agent_rule is None:
+                            agent_rule = create_rule_agent(model, Rule)
+
+                        # Define save callback
+                        # (saves cache to disk after each rule, debounced)
+                        def save_cache_callback():
+                            if config.save_cache_disk:
+                                cache_writer.request_save()
+
+                        # Generate rules with validation loop
+                        (
+                            new_rules_added,
+                            rule_prompt_toks,
+                            rule_completion_toks,
+                            llm_calls,
+                        ) = generate_rules_for_fields(
+                            agent_rule,
+                            llm_extracted,
+                            text_data,
+                            data["extraction_schema"],
+                            all_fields,
+                            label_cache,
+                            data["label"],
+                            config.max_attempts,
+                            save_cache_callback,
+                            context_chars=config.rule_context_chars,
+                            prompt_cache_dir=(
+                                str(config.data_folder / ".cache" / "rules")
+                                if config.rule_prompt_cache
+                                else None
+                            ),
+                            max_workers=config.rule_workers,
+                        )
+
+                        doc_prompt_tokens += rule_prompt_toks
+                        doc_completion_tokens += rule_completion_toks
+                        llm2_calls = llm_calls
+                        global_rule_count += new_rules_added
+
+                        logger.info("Generated %d new rules", new_rules_added)
+                    else:
+                        logger.debug("Cache disabled - skipping rule generation")
+                else:
+                    logger.warning(
+                        "LLM extraction failed (timeout or error). "
+                        "Skipping rule generation for %d fields: %s",
+                        len(failed_fields),
+                        failed_fields,
+                    )
+            else:
+                logger.info("All fields extracted from cache (100%% hit rate)")
+                if config.cache_filename and config.save_cache_disk:
+                    cache_writer.request_save()
+                    logger.debug(
+                        "Cache save requested after successful full extraction"
+                    )
 
-        # Update metrics if tracking enabled
-        if metrics_tracker:
-            total_rules_in_global_cache = sum(
-                len(rules_list)
-                for cache in dict_caches.values()
-                for rules_list in cache.fields.values()
+            # ====================================================================
+            # STEP 4: Evaluate Performance and Track Metrics
+            # ====================================================================
+
+            elapsed_time = time.time() - start_time
+
+            # Evaluate accuracy if ground truth available and the result is used
+            # (by the metrics tracker or the INFO logs)
+            accuracy_pct = 0.0
+            if "expected_answer" in data and (
+                metrics_tracker or logger.isEnabledFor(logging.INFO)
+            ):
+                accuracy_pct = evaluate_performance(ans, data["expected_answer"])
+
+            # Collect answer
+            all_answers.append(
+                {
+                    "idx": doc_idx,
+                    "label": data["label"],
+                    "expected": data.get("expected_answer", {}),
+                    "extracted": ans,
+                }
             )
 
-            metrics_tracker.update_per_doc(
-                doc_index=doc_idx,
-                doc_id=data.get("filename", f"doc_{doc_idx}"),
-                label=data["label"],
-                prompt_toks=doc_prompt_tokens,
-                completion_toks=doc_completion_tokens,
-                price_in=GPT_5_MINI_INPUT_COST,
-                price_out=GPT_5_MINI_OUTPUT_COST,
-                processing_time=elapsed_time,
-                accuracy_pct=accuracy_pct,
-                fields_correct=len(success_fields),
-                fields_failed=len(failed_fields),
-                total_fields=len(all_fields),
-                failed_field_names=failed_fields,
-                fast_path_success=(len(failed_fields) == 0),
-                new_rules_added=new_rules_added,
-                total_rules_in_local_cache=sum(
-                    len(r) for r in label_cache.fields.values()
-                ),
-                total_rules_in_global_cache=total_rules_in_global_cache,
-                llm1_calls=llm1_calls,
-                llm2_calls=llm2_calls,
-            )
+            # Update metrics if tracking enabled
+            if metrics_tracker:
+                metrics_tracker.update_per_doc(
+                    doc_index=doc_idx,
+                    doc_id=data.get("filename", f"doc_{doc_idx}"),
+                    label=data["label"],
+                    prompt_toks=doc_prompt_tokens,
+                    completion_toks=doc_completion_tokens,
+                    price_in=GPT_5_MINI_INPUT_COST,
+                    price_out=GPT_5_MINI_OUTPUT_COST,
+                    processing_time=elapsed_time,
+                    accuracy_pct=accuracy_pct,
+                    fields_correct=len(success_fields),
+                    fields_failed=len(failed_fields),
+                    total_fields=len(all_fields),
+                    failed_field_names=failed_fields,
+                    fast_path_success=(len(failed_fields) == 0),
+                    new_rules_added=new_rules_added,
+                    total_rules_in_local_cache=label_cache.num_rules,
+                    total_rules_in_global_cache=global_rule_count,
+                    llm1_calls=llm1_calls,
+                    llm2_calls=llm2_calls,
+                )
 
-            # Log to WandB
-            wandb.log(metrics_tracker.to_dict())
-            metrics_tracker.reset_per_doc()
+                # Log to WandB
+                wandb.log(metrics_tracker.to_dict())
+                metrics_tracker.reset_per_doc()
 
-        logger.info(
-            "Document %d complete - Time: %.2fs, Accuracy: %.1f%%",
-            doc_idx,
-            elapsed_time,
-            accuracy_pct,
-        )
+            logger.info(
+                "Document %d complete - Time: %.2fs, Accuracy: %.1f%%",
+                doc_idx,
+                elapsed_time,
+                accuracy_pct,
+            )
+    finally:
+        processed_dataset.close()
+        if config.use_cache and config.save_cache_disk:
+            cache_writer.flush(force=True)
 
     # ========================================================================
     # Final Save and Cleanup
     # ========================================================================
 
     logger.info("=" * 80)
-    logger.info("Pipeline complete - Processed %d documents", len(processed_dataset))
+    logger.info("Pipeline complete - Processed %d documents", num_docs)
 
     # Save final results
     save_results(all_answers, config)
 
-    # Save final cache (only if cache is enabled)
+    # Upload final cache (written to disk above, only if cache is enabled)
     if config.use_cache:
         save_cache(dict_caches, config)
 
@@ -422,5 +516,14 @@ if __name__ == "__main__":
     logger = get_logger(__name__, level=log_level)
     globals()["logger"] = logger
 
-    # Run pipeline
-    main(args)
+    # Run pipeline (optionally under cProfile, covering cache load and
+    # extraction as well as the LLM calls)
+    if args.profile:
+        profiler = cProfile.Profile()
+        try:
+            profiler.runcall(main, args)
+        finally:
+            profiler.dump_stats(args.profile)
+            logger.info("Profile written to %s", args.profile)
+    else:
+        main(args)
@@ -4,7 +4,7 @@ This module handles all metrics collection, experiment tracking via WandB/Weave,
 and performance evaluation for the extraction pipeline.
 """
 
-import json
+import logging
 import os
 from dataclasses import dataclass, field
 from typing import List
@@ -13,7 +13,7 @@ import weave
 
 import wandb
 from cache import save_dict_cache
-from data import format_dict, get_json_filename
+from data import dump_json, format_dict, get_json_filename
 from logger import get_logger
 
 logger = get_logger(__name__)
@@ -273,11 +273,12 @@ def evaluate_performance(extracted: dict, expected: dict) -> float:
 
     pct_correct = (num_correct / num_fields_expected) * 100.0
 
-    comparison = {
-        key: {"expected": ref_value, "extracted": extracted.get(key)}
-        for key, ref_value in expected.items()
-    }
-    logger.debug("Comparison:\n%s", format_dict(comparison))
+    if logger.isEnabledFor(logging.DEBUG):
+        comparison = {
+            key: {"expected": ref_value, "extracted": extracted.get(key)}
+            for key, ref_value in expected.items()
+        }
+        logger.debug("Comparison:\n%s", format_dict(comparison))
 
     logger.info(
         "Performance: %d/%d fields correct (%.2f%%)",
@@ -398,17 +399,16 @@ def save_results(all_answers: list, config):
     filepath = os.path.join(config.data_folder, filename)
     os.makedirs(config.data_folder, exist_ok=True)
 
-    if config.save_ans_disk:
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(all_answers, f, ensure_ascii=False, indent=4)
+    upload = config.save_ans_wandb and config.use_wandb
 
-        logger.info("Results saved to disk: %s", filepath)
+    # Write once, whether for disk or for WandB (which uploads from disk)
+    if config.save_ans_disk or upload:
+        dump_json(all_answers, filepath)
 
-    if config.save_ans_wandb and config.use_wandb:
-        # Save to disk first (WandB uploads from disk)
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(all_answers, f, ensure_ascii=False, indent=4)
+    if config.save_ans_disk:
+        logger.info("Results saved to disk: %s", filepath)
 
+    if upload:
         try:
             wandb.save(filepath)
             logger.info("Results uploaded to wandb: %s", filepath)
@@ -417,7 +417,10 @@ def save_results(all_answers: list, config):
 
 
 def save_cache(dict_caches: dict, config):
-    """Save all caches to a JSON file to disk and WandB.
+    """Upload all caches to WandB.
+
+    The cache file on disk is written by the pipeline's ``CacheWriter``; it
+    is only written here when saving to disk is disabled.
 
     Args:
         dict_caches: Dictionary mapping labels to Cache instances
@@ -427,9 +430,6 @@ def save_cache(dict_caches: dict, config):
         logger.warning("No caches to save.")
         return
 
-    if config.save_cache_disk:
-        save_dict_cache(dict_caches, config)
-
     if config.save_cache_wandb and config.use_wandb:
         if not config.cache_filename:
             cache_filename = config.dataset_filename + "_cache.json"
@@ -437,14 +437,13 @@ def save_cache(dict_caches: dict, config):
             cache_filename = get_json_filename(config.cache_filename)
 
         filepath = os.path.join(config.data_folder, cache_filename)
-        os.makedirs(config.data_folder, exist_ok=True)
 
-        data_to_save = {label: cache.to_dict() for label, cache in dict_caches.items()}
+        # Upload the file already on disk, or write it first (same path and
+        # format) when saving to disk is disabled
+        if not config.save_cache_disk:
+            save_dict_cache(dict_caches, config)
 
         try:
-            with open(filepath, "w", encoding="utf-8") as f:
-                json.dump(data_to_save, f, ensure_ascii=False, indent=4)
-
             wandb.save(filepath)
             logger.info("Caches uploaded to wandb: %s", filepath)
         except Exception as e:
@@ -5,6 +5,7 @@ the extraction workflow: cache-based extraction, LLM extraction,
 and rule generation with feedback loops.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Tuple
 
 from data import normalize_text
@@ -158,6 +159,9 @@ def generate_rules_for_fields(
     label: str,
     max_attempts: int,
     save_cache_fn: Optional[callable] = None,
+    context_chars: Optional[int] = None,
+    prompt_cache_dir: Optional[str] = None,
+    max_workers: int = 1,
 ) -> Tuple[int, int, int]:
     """Generate and cache rules for extracted fields.
 
@@ -166,6 +170,11 @@ def generate_rules_for_fields(
     2. Adds the rule to the cache if valid
     3. Optionally saves the cache to disk
 
+    Rule generation is independent per field and waits on the LLM, so with
+    ``max_workers > 1`` the fields are generated concurrently in threads.
+    Rules are still added to the cache and saved one at a time, in field
+    order, on the calling thread.
+
     Args:
         agent_rule: LangChain agent configured for rule generation
         extracted_fields: Dict of field names to extracted values
@@ -176,6 +185,11 @@ def generate_rules_for_fields(
         label: Document label for logging
         max_attempts: Maximum retry attempts for rule generation
         save_cache_fn: Optional callback to save cache after each rule
+        context_chars: If set, send only this many characters around each
+            value to the rule-generation LLM (see ``generate_robust_rule``)
+        prompt_cache_dir: If set, reuse rules stored for identical
+            rule-generation prompts (see ``generate_robust_rule``)
+        max_workers: Maximum concurrent rule-generation calls
 
     Returns:
         Tuple of (rules_generated, total_prompt_tokens, total_completion_tokens)
@@ -185,9 +199,7 @@ def generate_rules_for_fields(
     total_completion_tokens = 0
     llm2_calls = 0
 
-    for field, value in extracted_fields.items():
-        field_description = extraction_schema.get(field, "")
-
+    def generate(field, value):
         logger.debug(
             "Generating rule for field '%s' with value '%s'",
             field,
@@ -195,45 +207,66 @@ def generate_rules_for_fields(
         )
 
         # Generate rule with validation loop
-        rule_object, prompt_toks, completion_toks, llm_calls = generate_robust_rule(
+        return generate_robust_rule(
             agent_rule,
             text_data,
             field,
             value,
-            field_description,
+            extraction_schema.get(field, ""),
             all_fields,
             max_attempts=max_attempts,
+            context_chars=context_chars,
+            prompt_cache_dir=prompt_cache_dir,
         )
 
-        total_prompt_tokens += prompt_toks
-        total_completion_tokens += completion_toks
-        llm2_calls += llm_calls
+    workers = min(max_workers, len(extracted_fields))
+    executor = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        if executor is None:
+            results = map(generate, extracted_fields.keys(), extracted_fields.values())
+        else:
+            results = executor.map(
+                generate, extracted_fields.keys(), extracted_fields.values()
+            )
 
-        if rule_object is not None:
-            # Successfully generated and validated rule
-            cache.fields[field].add_rule(rule_object)
-            rules_generated += 1
+        for field, result in zip(extracted_fields, results):
+            rule_object, prompt_toks, completion_toks, llm_calls = result
 
-            logger.info(
-                "Rule added for field '%s' (label: '%s'). Total rules for this field: %d",
-                field,
-                label,
-                len(cache.fields[field]),
-            )
+            total_prompt_tokens += prompt_toks
+            total_completion_tokens += completion_toks
+            llm2_calls += llm_calls
 
-            # Save cache if callback provided
-            if save_cache_fn:
-                try:
-                    save_cache_fn()
-                    logger.debug("Cache saved after adding rule for field '%s'", field)
-                except Exception as e:
-                    logger.warning("Failed to save cache: %s", e)
-        else:
-            logger.warning(
-                "Failed to generate valid rule for field '%s' after %d attempts",
-                field,
-                max_attempts,
-            )
+            if rule_object is not None:
+                # Successfully generated and validated rule
+                cache.add_rule(field, rule_object)
+                rules_generated += 1
+
+                logger.info(
+                    "Rule added for field '%s' (label: '%s'). "
+                    "Total rules for this field: %d",
+                    field,
+                    label,
+                    len(cache.fields[field]),
+                )
+
+                # Save cache if callback provided
+                if save_cache_fn:
+                    try:
+                        save_cache_fn()
+                        logger.debug(
+                            "Cache saved after adding rule for field '%s'", field
+                        )
+                    except Exception as e:
+                        logger.warning("Failed to save cache: %s", e)
+            else:
+                logger.warning(
+                    "Failed to generate valid rule for field '%s' after %d attempts",
+                    field,
+                    max_attempts,
+                )
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
 
     logger.info(
         "Rule generation complete for label '%s': %d/%d rules generated successfully",
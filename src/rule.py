@@ -8,11 +8,15 @@ This module contains everything related to extraction rules:
 - Prompt templates
 """
 
+import hashlib
+import os
 import re
+from functools import cached_property, lru_cache
 from typing import Any, Dict, List, Optional, Tuple
 
 from pydantic import BaseModel, Field
 
+from data import dump_json, load_json
 from llm import RULE_GENERATION_PROMPT
 from logger import get_logger
 
@@ -39,6 +43,21 @@ class Rule(BaseModel):
         r"extracted value (e.g., '^\d{6}$' or '^$' for empty strings).",
     )
 
+    @cached_property
+    def rule_pattern(self) -> re.Pattern:
+        """Compiled extraction pattern, resolved once per rule instance.
+
+        Cached rules are applied to every document, so the compiled pattern
+        is kept on the instance rather than looked up in ``compile_pattern``
+        on each call. Invalid patterns raise ``re.error`` and are not cached.
+        """
+        return compile_pattern(self.rule, re.DOTALL)
+
+    @cached_property
+    def validation_pattern(self) -> re.Pattern:
+        """Compiled validation pattern, resolved once per rule instance."""
+        return compile_pattern(self.validation_regex)
+
     def apply(self, text: Optional[str]) -> Optional[str]:
         """Applies this rule to the given text and returns the extracted value."""
         if not text:
@@ -46,7 +65,7 @@ class Rule(BaseModel):
         try:
             return execute_rule(self, text)
         except Exception as e:
-            logger.error(f"Error applying rule: {e}")
+            logger.error("Error applying rule: %s", e)
             return None
 
     def validate(self, text: Optional[str]) -> bool:
@@ -57,9 +76,9 @@ class Rule(BaseModel):
         if text is None:
             return False
         try:
-            return re.match(self.validation_regex, text) is not None
+            return self.validation_pattern.match(text) is not None
         except Exception as e:
-            logger.error(f"Error validating text: {e}")
+            logger.error("Error validating text: %s", e)
             return False
 
 
@@ -68,6 +87,27 @@ class Rule(BaseModel):
 # ============================================================================
 
 
+@lru_cache(maxsize=4096)
+def compile_pattern(pattern: str, flags: int = 0) -> re.Pattern:
+    """Compile a rule regex once and share it across identical patterns.
+
+    Rules loaded or generated with the same pattern text (e.g. the same rule
+    cached for several labels) reuse a single compiled pattern instead of
+    each going through ``re``'s smaller internal cache on every call.
+
+    Args:
+        pattern: Regex pattern text
+        flags: ``re`` flags to compile with
+
+    Returns:
+        Compiled pattern
+
+    Raises:
+        re.error: If the pattern is invalid (failures are not cached)
+    """
+    return re.compile(pattern, flags)
+
+
 def execute_rule(rule: Rule, text: str) -> Optional[str]:
     """Executes a regex extraction rule on the input text.
 
@@ -79,7 +119,7 @@ def execute_rule(rule: Rule, text: str) -> Optional[str]:
         if not rule.rule:
             return None
 
-        match = re.search(rule.rule, text, re.DOTALL)
+        match = rule.rule_pattern.search(text)
 
         if match:
             try:
@@ -95,7 +135,7 @@ def execute_rule(rule: Rule, text: str) -> Optional[str]:
 
     except Exception as e:
         # Catch any unexpected errors during rule execution
-        logger.error(f"Error executing rule (rule: {rule.rule}): {e}")
+        logger.error("Error executing rule (rule: %s): %s", rule.rule, e)
         return None
 
 
@@ -112,6 +152,8 @@ def generate_robust_rule(
     field_description: str,
     all_fields: List[str],
     max_attempts: int = 3,
+    context_chars: Optional[int] = None,
+    prompt_cache_dir: Optional[str] = None,
 ) -> tuple[Optional[Rule], int, int, int]:
     """Generate a robust extraction rule with validation and feedback loop.
 
@@ -123,6 +165,12 @@ def generate_robust_rule(
         field_description: Description of what the field contains
         all_fields: List of all field names (for keyword contamination check)
         max_attempts: Maximum number of generation attempts
+        context_chars: If set, the prompt only carries this many characters
+            of text on each side of the value (see ``_context_window``);
+            the rule is still validated against the full text
+        prompt_cache_dir: If set, folder of rules keyed by the hash of the
+            prompt that produced them. A stored rule that still validates is
+            returned without calling the LLM; new rules are stored there
 
     Returns:
         tuple: (rule, total_prompt_tokens, total_completion_tokens, llm2_calls)
@@ -138,8 +186,11 @@ def generate_robust_rule(
     other_keywords = [fname for fname in all_fields if fname != field_name]
 
     # 1. Prepare the base prompt
+    prompt_text = text
+    if context_chars is not None:
+        prompt_text = _context_window(text, field_name, expected_value, context_chars)
     base_prompt = RULE_GENERATION_PROMPT.format(
-        text=text,
+        text=prompt_text,
         field_name=field_name,
         field_value=field_value,
         field_description=field_description,
@@ -147,6 +198,19 @@ def generate_robust_rule(
     )
     feedback_history: List[str] = []  # Stores feedback from failures
 
+    # Reuse a rule generated earlier from this exact prompt, if still valid
+    prompt_key = None
+    if prompt_cache_dir is not None:
+        prompt_key = hashlib.sha256(base_prompt.encode("utf-8")).hexdigest()
+        cached_rule = _load_prompt_cached_rule(prompt_cache_dir, prompt_key)
+        if cached_rule is not None:
+            failure = _validate_extraction_rule(
+                cached_rule, text, expected_value, field_name, 0
+            ) or _validate_validation_regex(cached_rule, expected_value, field_name, 0)
+            if failure is None:
+                logger.info("Reusing cached rule for field '%s'", field_name)
+                return cached_rule, 0, 0, 0
+
     for attempt in range(max_attempts):
         current_attempt = attempt + 1
         logger.info(
@@ -246,6 +310,8 @@ Now, generate a **new and corrected** rule below:
             field_name,
             current_attempt,
         )
+        if prompt_key is not None:
+            _store_prompt_cached_rule(prompt_cache_dir, prompt_key, rule)
         return rule, total_prompt_tokens, total_completion_tokens, llm2_calls
 
     # 9. Failure (after max_attempts)
@@ -257,6 +323,57 @@ Now, generate a **new and corrected** rule below:
     return None, total_prompt_tokens, total_completion_tokens, llm2_calls
 
 
+def _context_window(
+    text: str, field_name: str, field_value: str, context_chars: int
+) -> str:
+    """Cut the text down to the neighbourhood of a field for the prompt.
+
+    Rules must anchor on labels within a line or two of the value, so the LLM
+    rarely needs the whole document. The window is centred on the first
+    occurrence of the value, or of the field name for null fields, and falls
+    back to the full text when neither is found.
+
+    Args:
+        text: Full document text
+        field_name: Name of the field
+        field_value: Expected value ("" for null fields)
+        context_chars: Characters to keep on each side of the anchor
+
+    Returns:
+        Window of the text around the field
+    """
+    anchor = field_value
+    start = text.find(field_value) if field_value else -1
+    if start < 0:
+        anchor = field_name
+        start = text.lower().find(field_name.lower())
+    if start < 0:
+        return text
+    return text[max(0, start - context_chars) : start + len(anchor) + context_chars]
+
+
+def _load_prompt_cached_rule(cache_dir: str, key: str) -> Optional[Rule]:
+    """Load the rule stored for a prompt hash, or None if there is none."""
+    try:
+        return Rule.model_validate(load_json(os.path.join(cache_dir, key + ".json")))
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning("Ignoring unreadable cached rule %s: %s", key, e)
+        return None
+
+
+def _store_prompt_cached_rule(cache_dir: str, key: str, rule: Rule):
+    """Store a rule under its prompt hash (written atomically)."""
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        path = os.path.join(cache_dir, key + ".json")
+        dump_json(rule.model_dump(), path + ".tmp")
+        os.replace(path + ".tmp", path)
+    except OSError as e:
+        logger.warning("Failed to store cached rule %s: %s", key, e)
+
+
 # ============================================================================
 # SECTION 4: Rule Validation
 # ============================================================================
@@ -371,7 +488,7 @@ def _validate_validation_regex(
         None if validation passes, error message string if validation fails
     """
     try:
-        if re.match(rule.validation_regex, field_value):
+        if rule.validation_pattern.match(field_value):
             logger.debug(
                 "Validation regex successful for field '%s' (attempt %d)",
                 field_name,